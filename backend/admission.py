@@ -0,0 +1,84 @@
+"""
+Admission control for CPU-bound work
+At most `max_concurrent` computations run at once and at most `max_queue`
+wait for a slot. A request that finds the queue full, or cannot start
+within `timeout` seconds, is shed with Overloaded instead of slowing down
+every admitted request.
+"""
+import asyncio
+import math
+import time
+
+from metrics import metrics
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; retry_after is a hint in seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, deadline-limited wait queue"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, timeout: float, name: str = 'admission'):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.name = name
+        self.active = 0
+        self.waiting = 0
+        self._service_ms = 50.0  # running average of admitted computations
+        self._semaphore = asyncio.Semaphore(max(max_concurrent, 1))
+        metrics.register_ratio(f'{name}_shed_rate', f'{name}_shed', f'{name}_admitted')
+
+    def _publish(self):
+        metrics.set_gauge(f'{self.name}_queue_depth', self.waiting)
+        metrics.set_gauge(f'{self.name}_active', self.active)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained"""
+        backlog = (self.waiting + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(backlog * self._service_ms / 1000))
+
+    def _shed(self, reason: str):
+        metrics.incr(f'{self.name}_shed')
+        metrics.incr(f'{self.name}_shed_{reason}')
+        raise Overloaded(reason, self.retry_after())
+
+    async def run(self, func, *args):
+        """Await func(*args, queue_wait_ms=...) once admitted"""
+        if self.max_concurrent <= 0:
+            return await func(*args, queue_wait_ms=0.0)
+
+        if self.active + self.waiting >= self.max_concurrent + self.max_queue:
+            self._shed('queue_full')
+
+        arrived = time.perf_counter()
+        self.waiting += 1
+        self._publish()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._shed('deadline')
+        finally:
+            self.waiting -= 1
+            self._publish()
+
+        started = time.perf_counter()
+        queue_wait_ms = (started - arrived) * 1000
+        metrics.incr(f'{self.name}_admitted')
+        metrics.set_gauge(f'{self.name}_wait_ms', round(queue_wait_ms, 2))
+        self.active += 1
+        self._publish()
+        try:
+            return await func(*args, queue_wait_ms=queue_wait_ms)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._service_ms = 0.9 * self._service_ms + 0.1 * elapsed_ms
+            self.active -= 1
+            self._semaphore.release()
+            self._publish()
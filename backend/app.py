@@ -3,11 +3,25 @@ FastAPI Application for SHL Assessment Recommendation System
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Tuple
 import uvicorn
 from recommender import AssessmentRecommender
+from cache import TTLCache, canonical_query
+from cache_store import CacheStore, append_request_log, top_logged_queries
+from admission import AdmissionController, Overloaded
+from metrics import metrics
+from responses import dumps, extend_fragment, render_recommendations
+import asyncio
+import base64
+import hashlib
+import json
 import os
+import queue
+import threading
+import time
 
 app = FastAPI(title="SHL Assessment Recommendation API")
 
@@ -26,27 +40,159 @@ app.add_middleware(
 )
 
 
-# Initialize recommender as None - will load on first request
+DEFAULT_TOP_K = 10
+MAX_TOP_K = int(os.getenv("MAX_TOP_K", 50))
+
+
+# Pre-serialized response bodies keyed by (index version, query, top_k, offset)
+response_cache = TTLCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", 2048)),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", 600)),
+    maxbytes=int(float(os.getenv("RESPONSE_CACHE_MAX_MB", 32)) * 1024 * 1024),
+    sizeof=len,
+    name="response_cache"
+)
+
+
+# Uncached /recommend computations: concurrency limit, wait queue and the
+# longest a request may wait for a slot before it is shed with 503
+admission = AdmissionController(
+    max_concurrent=int(os.getenv("MAX_CONCURRENT_RECOMMENDATIONS") or os.cpu_count() or 1),
+    max_queue=int(os.getenv("ADMISSION_QUEUE_SIZE", 64)),
+    timeout=float(os.getenv("ADMISSION_TIMEOUT", 2.0))
+)
+
+
+# Optional cache snapshots and request-log warm-up
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH")
+CACHE_SNAPSHOT_INTERVAL = float(os.getenv("CACHE_SNAPSHOT_INTERVAL", 300))
+REQUEST_LOG = os.getenv("REQUEST_LOG")
+REQUEST_LOG_MAX_BYTES = int(float(os.getenv("REQUEST_LOG_MAX_MB", 16)) * 1024 * 1024)
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", 0))
+
+cache_store = CacheStore(CACHE_SNAPSHOT_PATH) if CACHE_SNAPSHOT_PATH else None
+request_log_queue = queue.SimpleQueue()
+warmed_up = threading.Event()
+shutting_down = threading.Event()
+# The periodic snapshot and the shutdown hook share CACHE_SNAPSHOT_PATH + '.tmp'
+cache_save_lock = threading.Lock()
+snapshot_thread = None
+
+
+# Loaded at startup by warm_up; get_recommender also serves requests that
+# arrive before warm-up has finished loading it
 recommender = None
+recommender_lock = threading.Lock()
 
 def get_recommender():
-    """Lazy load recommender on first request"""
+    """Return the recommender, loading it if warm-up has not done so yet"""
     global recommender
-    if recommender is None:
-        print("🚀 Initializing AssessmentRecommender...")
-        try:
-            recommender = AssessmentRecommender()
-            print("✅ Recommender initialized successfully!")
-        except Exception as e:
-            print(f"❌ Error initializing recommender: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
+    with recommender_lock:
+        if recommender is None:
+            print("🚀 Initializing AssessmentRecommender...")
+            try:
+                recommender = AssessmentRecommender()
+                print("✅ Recommender initialized successfully!")
+            except Exception as e:
+                print(f"❌ Error initializing recommender: {e}")
+                import traceback
+                traceback.print_exc()
+                raise
     return recommender
 
 
+def _snapshot_caches(rec) -> dict:
+    return {"query_embedding": rec._embedding_cache, "response": response_cache}
+
+
+def save_cache_snapshot():
+    """Write the embedding and response caches to CACHE_SNAPSHOT_PATH"""
+    if cache_store is None or recommender is None:
+        return
+    try:
+        with cache_save_lock:
+            count = cache_store.save(recommender.index_version, _snapshot_caches(recommender))
+        print(f"💾 Saved {count} cache entries to {CACHE_SNAPSHOT_PATH}")
+    except Exception as e:
+        print(f"⚠ Could not save cache snapshot: {e}")
+
+
+def warm_up():
+    """Load the recommender, restore cache snapshots and replay frequent queries"""
+    try:
+        rec = get_recommender()
+        if cache_store is not None:
+            count = cache_store.restore(rec.index_version, _snapshot_caches(rec))
+            print(f"♻️ Restored {count} cache entries from {CACHE_SNAPSHOT_PATH}")
+        if REQUEST_LOG and WARMUP_TOP_N > 0:
+            start = time.perf_counter()
+            queries = top_logged_queries(REQUEST_LOG, WARMUP_TOP_N)
+            for query, top_k in queries:
+                try:
+                    render_page(rec, query, min(max(top_k, 1), MAX_TOP_K), 0, rec.field_weights)
+                except Exception as e:
+                    print(f"⚠ Warm-up query failed: {e}")
+            print(f"🔥 Replayed {len(queries)} logged queries in {time.perf_counter() - start:.1f}s")
+    finally:
+        warmed_up.set()
+
+
+def _snapshot_periodically():
+    while not shutting_down.wait(CACHE_SNAPSHOT_INTERVAL):
+        save_cache_snapshot()
+
+
+def log_request(query: str, top_k: int):
+    """Queue a first-page request for REQUEST_LOG; the file is written off the event loop"""
+    if not REQUEST_LOG:
+        return
+    request_log_queue.put(json.dumps({"ts": time.time(), "query": query, "top_k": top_k}))
+
+
+def _write_request_log():
+    """Append queued requests to REQUEST_LOG in batches until shutdown"""
+    while True:
+        lines = [request_log_queue.get()]
+        while not request_log_queue.empty():
+            lines.append(request_log_queue.get_nowait())
+        done = None in lines
+        lines = [line for line in lines if line is not None]
+        if lines:
+            try:
+                append_request_log(REQUEST_LOG, lines, REQUEST_LOG_MAX_BYTES)
+            except OSError as e:
+                print(f"⚠ Could not write request log: {e}")
+        if done:
+            return
+
+
+@app.on_event("startup")
+def start_background_tasks():
+    global snapshot_thread
+    # Always load the recommender up front so /ready can turn green
+    threading.Thread(target=warm_up, daemon=True).start()
+    if REQUEST_LOG:
+        threading.Thread(target=_write_request_log, name="request-log", daemon=True).start()
+    if cache_store is not None and CACHE_SNAPSHOT_INTERVAL > 0:
+        snapshot_thread = threading.Thread(target=_snapshot_periodically, daemon=True)
+        snapshot_thread.start()
+
+
+@app.on_event("shutdown")
+def stop_background_tasks():
+    shutting_down.set()
+    request_log_queue.put(None)
+    # Let an in-flight periodic save finish before writing the final snapshot
+    if snapshot_thread is not None:
+        snapshot_thread.join()
+    save_cache_snapshot()
+
+
 class RecommendRequest(BaseModel):
     query: str
+    top_k: Optional[int] = None
+    cursor: Optional[str] = None
+    field_weights: Optional[Dict[str, float]] = None
 
 
 class AssessmentRecommendation(BaseModel):
@@ -57,10 +203,154 @@ class AssessmentRecommendation(BaseModel):
     duration: Optional[int] = None
     remote_support: str
     test_type: List[str]
+    matched_skills: List[str] = []
 
 
 class RecommendResponse(BaseModel):
     recommended_assessments: List[AssessmentRecommendation]
+    next_cursor: Optional[str] = None
+    degraded: bool = False
+
+
+class RawJSONResponse(Response):
+    """JSON response whose body is already encoded"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def _query_fingerprint(query: str, field_weights: Optional[tuple] = None) -> str:
+    text = canonical_query(query)
+    if field_weights is not None:
+        text += f"|{field_weights}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(query: str, offset: int, top_k: int,
+                  field_weights: Optional[tuple] = None, engine: Optional[str] = None) -> str:
+    """Opaque cursor pointing at the page after `offset` of the ranking by `engine`"""
+    payload = json.dumps({
+        'q': _query_fingerprint(query, field_weights), 'o': offset, 'k': top_k, 'e': engine
+    })
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, query: str, field_weights: Optional[tuple] = None):
+    """Return (offset, top_k, engine) for a cursor issued for this query and weights"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset, top_k = int(payload['o']), int(payload['k'])
+        fingerprint = payload['q']
+        engine = payload.get('e')
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if fingerprint != _query_fingerprint(query, field_weights):
+        raise HTTPException(status_code=400, detail="Cursor does not match query")
+    if offset < 0 or not 1 <= top_k <= MAX_TOP_K or engine not in (None, 'dense', 'lexical'):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset, top_k, engine
+
+
+def page_key(rec, query: str, top_k: int, offset: int,
+             field_weights: Optional[tuple] = None, engine: Optional[str] = None) -> tuple:
+    # Weights are resolved (normalized, defaulted) so equivalent ones share pages;
+    # engine is the one a cursor names (None: the engine currently serving)
+    return (rec.index_version, engine, canonical_query(query), top_k, offset, field_weights)
+
+
+def render_page(rec, query: str, top_k: int, offset: int,
+                field_weights: Optional[tuple] = None,
+                engine: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Serialized page of recommendations and the engine that ranked it,
+    from the response cache when possible
+    """
+    body = response_cache.get(page_key(rec, query, top_k, offset, field_weights, engine))
+    if body is not None:
+        return body, engine or rec.engine
+    return compute_page(rec, query, top_k, offset, field_weights, engine)
+
+
+def compute_page(rec, query: str, top_k: int, offset: int,
+                 field_weights: Optional[tuple] = None,
+                 engine: Optional[str] = None,
+                 queue_wait_ms: float = 0.0) -> Tuple[bytes, str]:
+    """Rank and serialize a page, then store it in the response cache"""
+    # Keyed before ranking: if the engine switches meanwhile, a dense page
+    # may land under the lexical version but never the other way round
+    cache_key = page_key(rec, query, top_k, offset, field_weights, engine)
+    
+    # Get recommendations
+    ranking = rec.rank(query, top_k=top_k, offset=offset, queue_wait_ms=queue_wait_ms,
+                       field_weights=field_weights, engine=engine)
+    
+    # Ensure minimum 5 recommendations on the first page
+    if offset == 0 and len(ranking.indices) < min(5, top_k):
+        raise HTTPException(
+            status_code=500, 
+            detail="Unable to generate minimum 5 recommendations"
+        )
+    
+    next_offset = offset + len(ranking.indices)
+    next_cursor = None
+    if ranking.indices and next_offset < ranking.total:
+        # The cursor names the engine, so the next page continues this ranking
+        next_cursor = encode_cursor(query, next_offset, top_k, field_weights, ranking.engine)
+    
+    # Assemble the response from fragments pre-encoded at index time
+    fragments = [rec.response_fragments[idx] for idx in ranking.indices]
+    if ranking.matched_skills is not None:
+        fragments = [
+            extend_fragment(fragment, {"matched_skills": skills})
+            for fragment, skills in zip(fragments, ranking.matched_skills)
+        ]
+    body = render_recommendations(
+        fragments,
+        next_cursor,
+        degraded=ranking.degraded
+    )
+    # Degraded pages are a fallback; the next request should try the encoder
+    if not ranking.degraded:
+        response_cache.put(cache_key, body)
+    return body, ranking.engine
+
+
+# Shared computations of pages currently being built, by response cache key
+inflight: Dict[tuple, asyncio.Task] = {}
+
+
+def _forget_inflight(key: tuple, task: asyncio.Task):
+    if inflight.get(key) is task:
+        del inflight[key]
+    if not task.cancelled():
+        task.exception()  # retrieved here so an unawaited failure is not logged
+
+
+async def coalesced_page(rec, query: str, top_k: int, offset: int,
+                         field_weights: Optional[tuple] = None,
+                         engine: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Single-flight compute_page: concurrent requests for the same page await
+    one shared task, which waits for admission before computing. The task is
+    shielded so a disconnecting client does not cancel it for the others;
+    its exception (including Overloaded) is raised in every waiter.
+    """
+    key = page_key(rec, query, top_k, offset, field_weights, engine)
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(admission.run(
+            run_in_threadpool, compute_page, rec, query, top_k, offset, field_weights, engine
+        ))
+        inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    else:
+        metrics.incr("coalesced_requests")
+    return await asyncio.shield(task)
 
 
 @app.get("/")
@@ -71,7 +361,9 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "recommend": "/recommend (POST)",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -79,52 +371,89 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
+    """Health check endpoint; reports the ranking engine once loaded"""
+    if recommender is None:
+        return {"status": "healthy", "engine": None}
+    return {
+        "status": "healthy",
+        "engine": recommender.engine,
+        "dense_ready_after_s": recommender.dense_ready_at
+    }
+
 
+@app.get("/ready")
+async def readiness_check():
+    """Ready once the recommender is loaded and cache warm-up has finished"""
+    if recommender is None or not warmed_up.is_set():
+        return Response(
+            content=dumps({"status": "starting"}),
+            status_code=503,
+            media_type="application/json"
+        )
+    return {"status": "ready"}
 
-@app.post("/recommend", response_model=RecommendResponse)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Cache and request counters"""
+    return metrics.snapshot()
+
+
+@app.post("/recommend", response_model=RecommendResponse, response_class=RawJSONResponse)
 async def recommend_assessments(request: RecommendRequest):
     """
     Recommend assessments based on query
-    Returns 5-10 most relevant assessments
+    Returns top_k (default 10) most relevant assessments; pass the returned
+    next_cursor back with the same query and field_weights to fetch the
+    following page
     """
     try:
         if not request.query or len(request.query.strip()) == 0:
             raise HTTPException(status_code=400, detail="Query cannot be empty")
         
-        # Get recommender (lazy load)
-        rec = get_recommender()
-        
-        # Get recommendations
-        recommendations = rec.recommend(request.query, top_k=10)
-        
-        # Ensure minimum 5 recommendations
-        if len(recommendations) < 5:
-            raise HTTPException(
-                status_code=500, 
-                detail="Unable to generate minimum 5 recommendations"
-            )
+        # Get recommender (loads off the event loop if warm-up is still running)
+        rec = recommender or await run_in_threadpool(get_recommender)
+        try:
+            field_weights = rec.resolve_field_weights(request.field_weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Format response according to API spec
-        formatted_recommendations = []
-        for rec in recommendations:
-            formatted_recommendations.append(
-                AssessmentRecommendation(
-                    url=rec['assessment_url'],
-                    name=rec['assessment_name'],
-                    adaptive_support=rec.get('adaptive_support', 'No'),
-                    description=rec.get('description', ''),
-                    duration=rec.get('duration'),
-                    remote_support=rec.get('remote_support', 'Yes'),
-                    test_type=rec.get('test_type', ['O'])
+        engine = None
+        if request.cursor:
+            # Page size and ranking engine are fixed by the first page
+            offset, top_k, engine = decode_cursor(request.cursor, request.query, field_weights)
+            if engine is not None and not rec.can_rank(engine):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Cursor is from a ranking this server no longer serves; start again without it"
                 )
-            )
+        else:
+            offset = 0
+            top_k = request.top_k if request.top_k is not None else DEFAULT_TOP_K
+            if not 1 <= top_k <= MAX_TOP_K:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"top_k must be between 1 and {MAX_TOP_K}"
+                )
+        
+        if offset == 0:
+            log_request(request.query, top_k)
         
-        return RecommendResponse(recommended_assessments=formatted_recommendations)
+        body = response_cache.get(page_key(rec, request.query, top_k, offset, field_weights, engine))
+        if body is None:
+            body, engine = await coalesced_page(rec, request.query, top_k, offset, field_weights, engine)
+        engine = engine or rec.engine
+        metrics.incr(f"{engine}_engine_responses")
+        return RawJSONResponse(content=body, headers={"X-Engine": engine})
     
     except HTTPException:
         raise
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -0,0 +1,163 @@
+"""
+Small in-memory caches used by the recommender and the API
+"""
+import threading
+import time
+import unicodedata
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from metrics import metrics
+
+
+def canonical_query(query: str) -> str:
+    """Unicode-normalized, case-folded, whitespace-collapsed form of a query"""
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after `ttl` seconds.
+    With `maxbytes`, entries are also evicted until the summed sizeof() of
+    the cached values fits. With `name`, hits, misses, evictions and size
+    are published to the metrics registry under that prefix.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0,
+                 maxbytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None,
+                 name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.name = name
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if name:
+            metrics.register_ratio(f'{name}_hit_rate', f'{name}_hits', f'{name}_misses')
+
+    def _count(self, event: str, value: int = 1):
+        if self.name:
+            metrics.incr(f'{self.name}_{event}', value)
+
+    def _publish_size(self):
+        if self.name:
+            metrics.set_gauge(f'{self.name}_entries', len(self._data))
+            metrics.set_gauge(f'{self.name}_bytes', self.nbytes)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._count('misses')
+                return None
+            self._data.move_to_end(key)
+        self._count('hits')
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Insert or refresh an entry, evicting the least recently used ones"""
+        if self.maxsize <= 0:
+            return
+        size = self.sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        evicted = 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value, size)
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                self._remove(next(iter(self._data)))
+                evicted += 1
+            self._publish_size()
+        if evicted:
+            self._count('evictions', evicted)
+
+    def items(self):
+        """Live (key, value, remaining ttl) entries, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value, expires - now)
+                    for key, (expires, value, _) in self._data.items() if expires > now]
+
+    def _remove(self, key: Hashable):
+        self.nbytes -= self._data.pop(key)[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self._publish_size()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    Recent query embeddings held in a small ring-buffer matrix. A lookup
+    returns the value cached for the nearest stored embedding when it lies
+    within `max_distance` cosine distance and was stored with equal params.
+    Embeddings must be L2-normalized.
+    """
+
+    def __init__(self, capacity: int, max_distance: float, name: Optional[str] = None):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.name = name
+        self._vectors = None
+        self._params = [None] * capacity
+        self._values = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        if name:
+            metrics.register_ratio(f'{name}_hit_rate', f'{name}_hits', f'{name}_misses')
+
+    def lookup(self, vector, params: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = None
+            if self._size:
+                similarities = self._vectors[:self._size] @ vector
+                for row in similarities.argsort()[::-1]:
+                    if 1.0 - similarities[row] > self.max_distance:
+                        break
+                    if self._params[row] == params:
+                        value = self._values[row]
+                        break
+        if self.name:
+            metrics.incr(f'{self.name}_hits' if value is not None else f'{self.name}_misses')
+        return value
+
+    def insert(self, vector, params: Hashable, value: Any):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.capacity, len(vector)), dtype=np.float32)
+            row = self._next
+            self._vectors[row] = vector
+            self._params[row] = params
+            self._values[row] = value
+            self._next = (row + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self._size = 0
+            self._params = [None] * self.capacity
+            self._values = [None] * self.capacity
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,129 @@
+"""
+Cache persistence across restarts
+Snapshots TTL caches to a local SQLite file and restores them when the
+index version still matches, and reads the request log used to warm the
+caches with the most frequent historical queries.
+"""
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from cache import TTLCache, canonical_query
+
+
+def _encode_value(value) -> Tuple[str, bytes]:
+    if isinstance(value, np.ndarray):
+        # Matrices (sentence windows of long queries) record their row width
+        kind = 'float32' if value.ndim == 1 else f'float32/{value.shape[-1]}'
+        return kind, np.ascontiguousarray(value, dtype=np.float32).tobytes()
+    return 'bytes', bytes(value)
+
+
+def _as_key(value):
+    """JSON-decoded key with lists turned back into (nested) tuples"""
+    return tuple(_as_key(v) for v in value) if isinstance(value, list) else value
+
+
+def _decode_value(kind: str, blob: bytes):
+    if kind.startswith('float32'):
+        array = np.frombuffer(blob, dtype=np.float32).copy()
+        width = kind.partition('/')[2]
+        return array.reshape(-1, int(width)) if width else array
+    return blob
+
+
+class CacheStore:
+    """SQLite file holding named cache snapshots for one index version"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, version: str, caches: Dict[str, TTLCache]) -> int:
+        """Write every live entry, replacing the previous snapshot atomically"""
+        tmp_path = self.path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        now = time.time()
+        count = 0
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute('CREATE TABLE meta (version TEXT)')
+            conn.execute(
+                'CREATE TABLE entries (cache TEXT, key TEXT, kind TEXT, value BLOB, expires REAL)'
+            )
+            conn.execute('INSERT INTO meta VALUES (?)', (version,))
+            for name, cache in caches.items():
+                rows = []
+                for key, value, remaining in cache.items():
+                    kind, blob = _encode_value(value)
+                    rows.append((name, json.dumps(list(key)), kind, blob, now + remaining))
+                conn.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?)', rows)
+                count += len(rows)
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.path)
+        return count
+
+    def restore(self, version: str, caches: Dict[str, TTLCache]) -> int:
+        """Load unexpired entries if the snapshot was taken for this version"""
+        if not os.path.exists(self.path):
+            return 0
+        now = time.time()
+        count = 0
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute('SELECT version FROM meta').fetchone()
+            if row is None or row[0] != version:
+                return 0
+            # Oldest first, so LRU order survives the round trip
+            for name, key, kind, blob, expires in conn.execute(
+                'SELECT cache, key, kind, value, expires FROM entries ORDER BY rowid'
+            ):
+                cache = caches.get(name)
+                if cache is None or expires <= now:
+                    continue
+                cache.put(_as_key(json.loads(key)), _decode_value(kind, blob), ttl=expires - now)
+                count += 1
+        except sqlite3.DatabaseError as e:
+            print(f"⚠ Ignoring unreadable cache snapshot {self.path}: {e}")
+            return 0
+        finally:
+            conn.close()
+        return count
+
+
+def append_request_log(path: str, lines: List[str], max_bytes: int = 0):
+    """
+    Append lines to a request log. Once it reaches max_bytes it is rotated
+    to path + '.1', replacing the previous rotation, so at most two files
+    of history are kept and read back at warm-up.
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(''.join(line + '\n' for line in lines))
+        size = f.tell()
+    if max_bytes > 0 and size >= max_bytes:
+        os.replace(path, path + '.1')
+
+
+def top_logged_queries(path: str, n: int) -> List[Tuple[str, int]]:
+    """The n most frequent (query, top_k) first-page requests in a request log and its rotation"""
+    counts = Counter()
+    originals = {}
+    for log_path in (path + '.1', path):
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = (canonical_query(entry['query']), int(entry['top_k']))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                counts[key] += 1
+                originals.setdefault(key, entry['query'])
+    return [(originals[key], key[1]) for key, _ in counts.most_common(n)]
@@ -0,0 +1,330 @@
+"""
+Columnar in-memory assessment catalog
+Numeric and enum fields live in numpy columns, strings are interned, and
+AssessmentRecord gives the API layer a lightweight per-row view.
+Catalogs can also be stored as Arrow IPC files and memory-mapped back.
+"""
+import json
+import sys
+import numpy as np
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Test type letters; unknown letters are appended as they are seen
+TEST_TYPES = ['A', 'B', 'C', 'D', 'E', 'K', 'P', 'S', 'O']
+NO_DURATION = -1
+
+# Fields embedded separately for field-weighted scoring, in matrix order
+FIELDS = ('name', 'description', 'skills')
+
+
+class AssessmentRecord:
+    """Read-only view of one catalog row"""
+    __slots__ = ('name', 'url', 'description', 'test_type', 'adaptive_support',
+                 'remote_support', 'duration', 'skills')
+
+    def __init__(self, name: str, url: str, description: str, test_type: tuple,
+                 adaptive_support: str, remote_support: str,
+                 duration: Optional[int], skills: tuple):
+        self.name = name
+        self.url = url
+        self.description = description
+        self.test_type = test_type
+        self.adaptive_support = adaptive_support
+        self.remote_support = remote_support
+        self.duration = duration
+        self.skills = skills
+
+    # Mapping-style access so code written against the JSON dicts keeps working
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'url': self.url,
+            'description': self.description,
+            'test_type': list(self.test_type),
+            'adaptive_support': self.adaptive_support,
+            'remote_support': self.remote_support,
+            'duration': self.duration,
+            'skills': list(self.skills)
+        }
+
+
+class Catalog:
+    """Assessments stored column by column"""
+
+    def __init__(self):
+        self.type_table = list(TEST_TYPES)
+        self._type_codes = {t: i for i, t in enumerate(self.type_table)}
+
+        self.names: Sequence[str] = []
+        self.urls: Sequence[str] = []
+        self.descriptions: Sequence[str] = []
+        self.skills: Sequence[tuple] = []
+        self.test_types: Sequence[tuple] = []  # every type letter, for output
+        self.test_type_codes = np.empty(0, dtype=np.int8)  # first type, for balancing
+        self.durations = np.empty(0, dtype=np.int32)
+        self.adaptive = np.empty(0, dtype=bool)
+        self.remote = np.empty(0, dtype=bool)
+
+        # Growable build buffers, turned into numpy columns by finish()
+        self._codes = array('b')
+        self._durations = array('i')
+        self._adaptive = array('B')
+        self._remote = array('B')
+        self._type_tuples: Dict[tuple, tuple] = {}  # one shared tuple per combination
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'Catalog':
+        """Build a catalog from assessment dicts as stored in assessments.json"""
+        catalog = cls()
+        catalog.extend(records)
+        catalog.finish()
+        return catalog
+
+    def extend(self, records: Iterable[Dict]):
+        """Append assessment dicts; call finish() once every row is added"""
+        intern = sys.intern
+
+        for record in records:
+            self.names.append(intern(record['name']))
+            self.urls.append(intern(record['url']))
+            self.descriptions.append(record.get('description', ''))
+            self.skills.append(tuple(intern(s) for s in record.get('skills', [])))
+
+            test_type = record.get('test_type', 'O')
+            types = (test_type,) if isinstance(test_type, str) else tuple(test_type) or ('O',)
+            self.test_types.append(self._type_tuples.setdefault(types, types))
+            # Balancing works on a single type per assessment
+            self._codes.append(self.type_code(types[0], add=True))
+            for extra in types[1:]:
+                self.type_code(extra, add=True)
+
+            duration = record.get('duration')
+            self._durations.append(NO_DURATION if duration is None else int(duration))
+            self._adaptive.append(record.get('adaptive_support', 'No') == 'Yes')
+            self._remote.append(record.get('remote_support', 'Yes') == 'Yes')
+
+    def finish(self):
+        """Expose the build buffers as numpy columns (views, no copy)"""
+        self.test_type_codes = np.frombuffer(self._codes, dtype=np.int8)
+        self.durations = np.frombuffer(self._durations, dtype=np.intc).astype(np.int32, copy=False)
+        self.adaptive = np.frombuffer(self._adaptive, dtype=np.uint8).view(bool)
+        self.remote = np.frombuffer(self._remote, dtype=np.uint8).view(bool)
+
+    def type_code(self, test_type: str, add: bool = False) -> int:
+        """Integer code for a test type letter, or -1 if unknown"""
+        code = self._type_codes.get(test_type)
+        if code is None:
+            if not add:
+                return -1
+            code = len(self.type_table)
+            self.type_table.append(test_type)
+            self._type_codes[test_type] = code
+        return code
+
+    def test_type(self, idx: int) -> str:
+        return self.type_table[self.test_type_codes[idx]]
+
+    def duration(self, idx: int) -> Optional[int]:
+        duration = int(self.durations[idx])
+        return None if duration == NO_DURATION else duration
+
+    def index_text(self, idx: int) -> str:
+        """Text used to embed an assessment"""
+        return f"{self.names[idx]} {self.descriptions[idx]} {' '.join(self.skills[idx])}"
+
+    def field_text(self, idx: int, field: str) -> str:
+        """Text of one FIELDS entry, embedded on its own"""
+        if field == 'skills':
+            return ' '.join(self.skills[idx])
+        return self.names[idx] if field == 'name' else self.descriptions[idx]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, idx: int) -> AssessmentRecord:
+        idx = int(idx)
+        return AssessmentRecord(
+            name=self.names[idx],
+            url=self.urls[idx],
+            description=self.descriptions[idx],
+            test_type=self.test_types[idx],
+            adaptive_support='Yes' if self.adaptive[idx] else 'No',
+            remote_support='Yes' if self.remote[idx] else 'No',
+            duration=self.duration(idx),
+            skills=self.skills[idx]
+        )
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+def iter_json_records(path: str) -> Iterator[Dict]:
+    """
+    Yield assessments one at a time from a JSON Lines file, or from a JSON
+    array using ijson when it is installed
+    """
+    with open(path, 'rb') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        try:
+            import ijson
+        except ImportError:
+            print("⚠ ijson not installed; parsing the whole file at once")
+            yield from json.load(f)
+            return
+
+        yield from ijson.items(f, 'item', use_float=True)
+
+
+class _ArrowColumn:
+    """Sequence over an Arrow array that materializes values on access"""
+
+    def __init__(self, array, convert=None):
+        self._array = array
+        self._convert = convert
+
+    def __getitem__(self, idx: int):
+        value = self._array[int(idx)].as_py()
+        return self._convert(value) if self._convert else value
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+
+def _single_chunk(table, name: str):
+    column = table.column(name)
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _catalog_level(values, n: int):
+    """List column holding values in row 0 and an empty list in every other row"""
+    import pyarrow as pa
+
+    offsets = np.full(n + 1, len(values), dtype=np.int32)
+    offsets[0] = 0
+    return pa.ListArray.from_arrays(pa.array(offsets), values)
+
+
+def write_arrow(path: str, catalog: Catalog, embeddings: np.ndarray,
+                fragments: List[bytes], model_name: str, skill_index=None, term_table=None):
+    """
+    Write a catalog, its normalized embeddings and response fragments as an
+    uncompressed Arrow IPC file, so it can be memory-mapped without copies.
+    A SkillIndex is stored as a per-row list of skill columns (the list
+    offsets are its CSR indptr) plus its vocabulary in row 0 of a list column.
+    A TermTable's terms and vectors are stored in row 0 the same way.
+    """
+    import pyarrow as pa
+
+    n, dim = embeddings.shape
+    flat = pa.array(np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1))
+    columns = {
+        'name': pa.array(list(catalog.names), type=pa.string()),
+        'url': pa.array(list(catalog.urls), type=pa.string()),
+        'description': pa.array(list(catalog.descriptions), type=pa.string()),
+        'skills': pa.array([list(s) for s in catalog.skills], type=pa.list_(pa.string())),
+        'test_type': pa.array(catalog.test_type_codes, type=pa.int8()),
+        'test_types': pa.array([list(t) for t in catalog.test_types], type=pa.list_(pa.string())),
+        'duration': pa.array(catalog.durations, type=pa.int32()),
+        'adaptive': pa.array(catalog.adaptive.astype(np.uint8), type=pa.uint8()),
+        'remote': pa.array(catalog.remote.astype(np.uint8), type=pa.uint8()),
+        'fragment': pa.array(list(fragments), type=pa.binary()),
+        'embedding': pa.FixedSizeListArray.from_arrays(flat, dim)
+    }
+    if skill_index is not None and n > 0:
+        matrix = skill_index.matrix
+        columns['skill_columns'] = pa.ListArray.from_arrays(
+            pa.array(matrix.indptr.astype(np.int32)), pa.array(matrix.indices.astype(np.int32))
+        )
+        columns['skill_vocabulary'] = _catalog_level(pa.array(skill_index.skills(), type=pa.string()), n)
+    if term_table is not None and len(term_table) and n > 0:
+        vectors = np.ascontiguousarray(term_table.vectors, dtype=np.float32)
+        columns['terms'] = _catalog_level(pa.array(term_table.terms(), type=pa.string()), n)
+        columns['term_vectors'] = _catalog_level(
+            pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), vectors.shape[1]), n
+        )
+    table = pa.table(columns)
+    table = table.replace_schema_metadata({
+        'type_table': json.dumps(catalog.type_table),
+        'model_name': model_name
+    })
+
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(n, 1))
+
+
+def load_arrow(path: str) -> Tuple[Catalog, np.ndarray, Sequence[bytes], Dict, Dict]:
+    """
+    Load a catalog written by write_arrow.
+    Arrow IPC files are memory-mapped: numeric columns and the embedding
+    matrix are numpy views over the mapping, and text columns are only
+    decoded for the rows that are read. Parquet files are supported too,
+    but are decoded into memory. The last item holds the stored index
+    arrays (skill_indptr, skill_indices, skill_vocabulary, terms,
+    term_vectors), when present.
+    """
+    import pyarrow as pa
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+    else:
+        source = pa.memory_map(path, 'r')
+        table = pa.ipc.open_file(source).read_all()
+
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+
+    catalog = Catalog()
+    catalog.type_table = json.loads(metadata.get('type_table', json.dumps(TEST_TYPES)))
+    catalog._type_codes = {t: i for i, t in enumerate(catalog.type_table)}
+
+    catalog.names = _ArrowColumn(_single_chunk(table, 'name'))
+    catalog.urls = _ArrowColumn(_single_chunk(table, 'url'))
+    catalog.descriptions = _ArrowColumn(_single_chunk(table, 'description'))
+    catalog.skills = _ArrowColumn(_single_chunk(table, 'skills'), tuple)
+    catalog.test_type_codes = _single_chunk(table, 'test_type').to_numpy(zero_copy_only=True)
+    if 'test_types' in table.column_names:
+        catalog.test_types = _ArrowColumn(_single_chunk(table, 'test_types'), tuple)
+    else:
+        catalog.test_types = [(catalog.type_table[code],) for code in catalog.test_type_codes]
+    catalog.durations = _single_chunk(table, 'duration').to_numpy(zero_copy_only=True)
+    catalog.adaptive = _single_chunk(table, 'adaptive').to_numpy(zero_copy_only=True).view(bool)
+    catalog.remote = _single_chunk(table, 'remote').to_numpy(zero_copy_only=True).view(bool)
+
+    embedding = _single_chunk(table, 'embedding')
+    dim = embedding.type.list_size
+    embeddings = embedding.values.to_numpy(zero_copy_only=True).reshape(-1, dim)
+
+    fragments = _ArrowColumn(_single_chunk(table, 'fragment'))
+
+    indexes = {}
+    if 'skill_columns' in table.column_names:
+        skill_columns = _single_chunk(table, 'skill_columns')
+        indexes['skill_indptr'] = skill_columns.offsets.to_numpy(zero_copy_only=True)
+        indexes['skill_indices'] = skill_columns.values.to_numpy(zero_copy_only=True)
+        indexes['skill_vocabulary'] = _single_chunk(table, 'skill_vocabulary').values.to_pylist()
+    if 'term_vectors' in table.column_names:
+        term_vectors = _single_chunk(table, 'term_vectors').values
+        indexes['terms'] = _single_chunk(table, 'terms').values.to_pylist()
+        indexes['term_vectors'] = term_vectors.values.to_numpy(zero_copy_only=True).reshape(
+            -1, term_vectors.type.list_size
+        )
+    return catalog, embeddings, fragments, metadata, indexes
@@ -0,0 +1,56 @@
+"""
+Sentence windows for queries longer than the encoder input
+The encoder truncates its input (128 word pieces for MiniLM, about 1.3
+per English word and more for jargon), so a pasted job description is cut
+into overlapping windows of whole sentences that each fit, and all windows
+are encoded as one batch. Short queries can also be split into candidate
+requirement clauses at punctuation and connectives.
+"""
+import re
+from typing import List
+
+# Sentence ends, plus bullets and dashes that start list items in ATS exports
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;])\s+|\s*[•▪●◦]\s*|\s+[-*]\s+')
+
+# Punctuation and connectives that usually start another requirement
+CLAUSE_BOUNDARY = re.compile(
+    r'[,;:()]|[.!?](?=\s)|\s(?:plus|who|that|and also|as well as|along with|in addition to)\s'
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def sentence_windows(text: str, max_words: int = 64, overlap: int = 1) -> List[str]:
+    """
+    Consecutive sentences grouped into windows of at most max_words words,
+    each repeating the last `overlap` sentences of the previous window.
+    Text that fits in one window is returned unchanged.
+    """
+    if max_words <= 0 or len(text.split()) <= max_words:
+        return [text]
+
+    sentences = []
+    for sentence in split_sentences(text):
+        words = sentence.split()
+        # A run-on sentence longer than a window is cut into word pieces
+        for start in range(0, len(words), max_words):
+            sentences.append(words[start:start + max_words])
+
+    windows = []
+    start = 0
+    while start < len(sentences):
+        end, count = start, 0
+        while end < len(sentences) and (end == start or count + len(sentences[end]) <= max_words):
+            count += len(sentences[end])
+            end += 1
+        windows.append(' '.join(word for sentence in sentences[start:end] for word in sentence))
+        if end == len(sentences):
+            break
+        start = max(end - overlap, start + 1)
+    return windows
+
+
+def split_clauses(text: str) -> List[str]:
+    return [c.strip() for c in CLAUSE_BOUNDARY.split(text) if c and c.strip()]
@@ -0,0 +1,329 @@
+"""
+Text encoders for the recommender
+All backends return float32 sentence embeddings from encode(texts); heavy
+dependencies are imported only by the backend that needs them, so the ONNX
+and static backends never import torch.
+"""
+import json
+import multiprocessing
+import os
+import re
+import sys
+import zlib
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class Encoder:
+    """Interface shared by all encoder backends"""
+    model_name: str = ''
+    backend: str = ''
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the vector space, e.g. for cache keys"""
+        return f"{self.backend}:{self.model_name}"
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        raise NotImplementedError
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Input length of each text, used to batch texts of similar length"""
+        # Character length is a proxy for backends without a tokenizer
+        return [len(text) for text in texts]
+
+
+class SentenceTransformerEncoder(Encoder):
+    """
+    PyTorch forward pass through sentence-transformers, from the hub by name
+    or from a local bundle written by scripts/build_model_bundle.py
+    """
+    backend = 'torch'
+
+    def __init__(self, model_name: str, model_path: str = None):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_path or model_name)
+        if model_path:
+            self._map_weights(model_path)
+
+    def _map_weights(self, model_path: str):
+        """
+        Point the transformer weights at the memory-mapped safetensors file
+        instead of private copies, so workers on one host share those pages
+        """
+        weights = os.path.join(model_path, 'model.safetensors')
+        if not os.path.exists(weights):
+            return
+        from safetensors.torch import load_file
+        try:
+            self.model[0].auto_model.load_state_dict(load_file(weights), assign=True)
+        except TypeError:  # torch < 2.1 has no assign=; keep the loaded copies
+            pass
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        ids = self.model.tokenizer(texts, add_special_tokens=False)['input_ids']
+        return [len(row) for row in ids]
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        return self.model.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+        ).astype(np.float32, copy=False)
+
+
+class OnnxEncoder(Encoder):
+    """
+    ONNX Runtime on CPU, using a graph exported by scripts/export_onnx.py
+    (transformer + mean pooling) and the fast tokenizer saved next to it
+    """
+    backend = 'onnx'
+
+    def __init__(self, model_dir: str, quantized: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, 'encoder_config.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.model_name = config['model_name']
+        if quantized:
+            self.backend = 'onnx-int8'
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = int(os.getenv('ONNX_THREADS', 0))
+        if threads:
+            options.intra_op_num_threads = threads
+        model_file = 'model_quantized.onnx' if quantized else 'model.onnx'
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=config.get('pad_token_id', 0))
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        # Padding is on, so count the attended (truncated) tokens
+        return [sum(e.attention_mask) for e in self.tokenizer.encode_batch(texts)]
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            feed = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            }
+            if 'token_type_ids' in self.input_names:
+                feed['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+            outputs.append(self.session.run(['sentence_embedding'], feed)[0])
+        if not outputs:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate(outputs).astype(np.float32, copy=False)
+
+
+class StaticEncoder(Encoder):
+    """
+    Distilled static embeddings (scripts/distill_static_encoder.py): one
+    vector per vocabulary token, and a text is the weighted mean of its
+    token vectors. No attention layers, so encoding is a numpy gather.
+    """
+    backend = 'static'
+
+    def __init__(self, model_dir: str):
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, 'encoder_config.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.model_name = config['model_name']
+        self.vectors = np.load(os.path.join(model_dir, 'embeddings.npy'), mmap_mode='r')
+        self.weights = np.load(os.path.join(model_dir, 'weights.npy'))
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.no_padding()
+        self.tokenizer.no_truncation()
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        return [e.ids for e in self.tokenizer.encode_batch(texts, add_special_tokens=False)]
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        return [len(ids) for ids in self.tokenize(texts)]
+
+    def encode_ids(self, token_ids: List[List[int]]) -> np.ndarray:
+        """Weighted mean of token vectors for already tokenized texts"""
+        output = np.zeros((len(token_ids), self.vectors.shape[1]), dtype=np.float32)
+        for row, ids in enumerate(token_ids):
+            if ids:
+                weights = self.weights[ids]
+                total = weights.sum()
+                if total > 0:
+                    output[row] = weights @ self.vectors[ids] / total
+        return output
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        return self.encode_ids(self.tokenize(texts))
+
+
+class HashedEncoder(Encoder):
+    """
+    Hashed bag-of-words vectors for benchmarks: every word maps to a fixed
+    random vector seeded by its CRC32, and a text is the sum of its words.
+    Needs no model files or torch, and has no semantic quality, so it only
+    times the code around the encoder.
+    """
+    backend = 'hashed'
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.model_name = f"bow-{dim}"
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        output = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                output[row] += np.random.default_rng(zlib.crc32(word.encode())).standard_normal(self.dim)
+        return output
+
+
+class ShortQueryEncoder(Encoder):
+    """Route texts of at most max_tokens tokens to the static encoder"""
+
+    def __init__(self, full: Encoder, static: StaticEncoder, max_tokens: int):
+        self.full = full
+        self.static = static
+        self.max_tokens = max_tokens
+        self.model_name = full.model_name
+        self.backend = f"{full.backend}+static{max_tokens}"
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        token_ids = self.static.tokenize(texts)
+        if all(len(ids) <= self.max_tokens for ids in token_ids):
+            return self.static.encode_ids(token_ids)
+        return self.full.encode(texts, batch_size=batch_size)
+
+
+def load_query_encoder(encoder: Encoder) -> Encoder:
+    """
+    Encoder for queries: the catalog encoder, or a router that sends queries
+    of up to STATIC_QUERY_MAX_TOKENS tokens to the static encoder
+    """
+    max_tokens = int(os.getenv('STATIC_QUERY_MAX_TOKENS', 0))
+    if max_tokens <= 0 or isinstance(encoder, StaticEncoder):
+        return encoder
+    return ShortQueryEncoder(encoder, StaticEncoder(os.getenv('STATIC_ENCODER_PATH', 'models/static')), max_tokens)
+
+
+def _load_torch_encoder(model_name: str) -> SentenceTransformerEncoder:
+    """
+    sentence-transformers model from the MODEL_PATH bundle if set, else by
+    name from the hub. OFFLINE_MODE=1 requires the bundle and disables hub
+    access, so a missing file fails instead of downloading.
+    """
+    model_path = os.getenv('MODEL_PATH')
+    if os.getenv('OFFLINE_MODE') == '1':
+        if not model_path or not os.path.isfile(os.path.join(model_path, 'bundle.json')):
+            raise RuntimeError(
+                "OFFLINE_MODE=1 requires MODEL_PATH to point at a model bundle "
+                "(python scripts/build_model_bundle.py)"
+            )
+        # Read by huggingface_hub and transformers when first imported
+        os.environ['HF_HUB_OFFLINE'] = '1'
+        os.environ['TRANSFORMERS_OFFLINE'] = '1'
+
+    if not model_path:
+        return SentenceTransformerEncoder(model_name)
+    manifest = os.path.join(model_path, 'bundle.json')
+    if os.path.isfile(manifest):
+        with open(manifest, 'r', encoding='utf-8') as f:
+            bundle_model = json.load(f)['model_name']
+        if bundle_model != model_name:
+            print(f"⚠ Model bundle in {model_path} was built from {bundle_model}")
+        model_name = bundle_model
+    return SentenceTransformerEncoder(model_name, model_path=model_path)
+
+
+def load_encoder(model_name: str) -> Encoder:
+    """
+    Build the encoder selected by ENCODER_BACKEND:
+      torch (default) - sentence-transformers (MODEL_PATH bundle, OFFLINE_MODE=1)
+      onnx            - ONNX Runtime graph in ENCODER_PATH (ONNX_QUANTIZED=1 for int8)
+      static          - distilled token vectors in STATIC_ENCODER_PATH
+      hashed          - hashed bag-of-words, for benchmarks only
+    """
+    backend = os.getenv('ENCODER_BACKEND', 'torch').lower()
+    if backend == 'hashed':
+        return HashedEncoder()
+    if backend == 'static':
+        return StaticEncoder(os.getenv('STATIC_ENCODER_PATH', 'models/static'))
+    if backend == 'onnx':
+        model_dir = os.getenv('ENCODER_PATH', 'models/onnx')
+        encoder = OnnxEncoder(model_dir, quantized=os.getenv('ONNX_QUANTIZED') == '1')
+        if encoder.model_name != model_name:
+            print(f"⚠ ONNX encoder in {model_dir} was exported from {encoder.model_name}")
+        return encoder
+    if backend == 'torch':
+        return _load_torch_encoder(model_name)
+    raise ValueError(f"Unknown ENCODER_BACKEND: {backend}")
+
+
+# Per-process state of encode_parallel workers
+_worker_encoder: Optional[Encoder] = None
+_worker_error: Optional[Exception] = None
+_worker_batch_size = 32
+
+
+def _init_worker(model_name: str, threads: int, batch_size: int):
+    """Load one encoder replica, limited to `threads` intra-op threads"""
+    global _worker_encoder, _worker_error, _worker_batch_size
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['ONNX_THREADS'] = str(threads)
+    _worker_batch_size = batch_size
+    try:
+        _worker_encoder = load_encoder(model_name)
+    except Exception as e:
+        # Raising here would make the pool respawn the worker forever
+        _worker_error = e
+        return
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _encode_shard(shard: Tuple[int, List[str]]) -> Tuple[int, np.ndarray]:
+    if _worker_error is not None:
+        raise _worker_error
+    start, texts = shard
+    return start, _worker_encoder.encode(texts, batch_size=_worker_batch_size)
+
+
+def encode_parallel(model_name: str, texts: List[str], workers: int,
+                    batch_size: int = 32, shard_size: int = 1024,
+                    lengths: Optional[List[int]] = None) -> np.ndarray:
+    """
+    Encode texts on a pool of `workers` processes, each with its own model
+    replica and an equal share of the CPU threads. Texts are sorted by
+    `lengths` (tokens, from Encoder.token_lengths) so batches pad little;
+    without them character length stands in as a proxy. Shards are handed
+    out as workers free up, and each shard's vectors are written straight
+    into one preallocated matrix.
+    """
+    if lengths is None:
+        lengths = [len(text) for text in texts]
+    order = np.argsort(lengths, kind='stable')
+    shards = [
+        (start, [texts[i] for i in order[start:start + shard_size]])
+        for start in range(0, len(texts), shard_size)
+    ]
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    output = None
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(model_name, threads, batch_size)) as pool:
+        for start, vectors in pool.imap_unordered(_encode_shard, shards):
+            if output is None:
+                output = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            output[order[start:start + len(vectors)]] = vectors
+    if output is None:
+        return np.empty((0, 0), dtype=np.float32)
+    return output
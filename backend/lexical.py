@@ -0,0 +1,62 @@
+"""
+BM25 keyword index over the catalog
+Used instead of the transformer when the encoder is saturated: scoring a
+query is a sparse column lookup and sum, with no model forward pass.
+"""
+import numpy as np
+from collections import Counter
+from scipy import sparse
+from typing import Dict, Iterable, List
+
+from terms import FILLER_WORDS, tokenize
+
+
+class BM25Index:
+    """Okapi BM25 weights stored as a (documents x vocabulary) CSC matrix"""
+
+    def __init__(self, texts: Iterable[str], k1: float = 1.2, b: float = 0.75):
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, counts, lengths = [], [], [], []
+        for doc, text in enumerate(texts):
+            tokens = [t for t in tokenize(text) if t not in FILLER_WORDS]
+            lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                rows.append(doc)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                counts.append(count)
+
+        self.num_docs = len(lengths)
+        lengths = np.asarray(lengths, dtype=np.float32)
+        tf = np.asarray(counts, dtype=np.float32)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        doc_freq = np.bincount(cols, minlength=len(self.vocabulary)).astype(np.float32)
+        idf = np.log1p((self.num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1.0)) if self.num_docs else lengths
+        weights = idf[cols] * tf * (k1 + 1) / (tf + norm[rows])
+
+        self.matrix = sparse.csc_matrix(
+            (weights, (rows, cols)), shape=(self.num_docs, len(self.vocabulary)), dtype=np.float32
+        )
+
+    @classmethod
+    def from_arrays(cls, vocabulary: List[str], data: np.ndarray, indices: np.ndarray,
+                    indptr: np.ndarray, num_docs: int) -> 'BM25Index':
+        """Rebuild an index from its vocabulary and CSC arrays"""
+        index = cls.__new__(cls)
+        index.vocabulary = {token: i for i, token in enumerate(vocabulary)}
+        index.num_docs = num_docs
+        index.matrix = sparse.csc_matrix(
+            (data, indices, indptr), shape=(num_docs, len(vocabulary)), copy=False
+        )
+        return index
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every document for the query, scaled to [0, 1]"""
+        columns = [self.vocabulary[t] for t in set(tokenize(query)) if t in self.vocabulary]
+        if not columns:
+            return np.zeros(self.num_docs, dtype=np.float32)
+        scores = np.asarray(self.matrix[:, columns].sum(axis=1), dtype=np.float32).ravel()
+        top = scores.max()
+        return scores / top if top > 0 else scores
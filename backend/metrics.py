@@ -0,0 +1,49 @@
+"""
+In-process metrics registry
+Counters and gauges shared by the recommender and the API, served on /metrics
+"""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = {}
+        self._ratios = {}
+
+    def incr(self, name: str, value: int = 1):
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_ratio(self, name: str, hits: str, misses: str):
+        """Report hits / (hits + misses) under `name` in snapshots"""
+        with self._lock:
+            self._ratios[name] = (hits, misses)
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict:
+        """Return a JSON-serializable copy of all metrics"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            ratios = {}
+            for name, (hits, misses) in self._ratios.items():
+                total = counters.get(hits, 0) + counters.get(misses, 0)
+                ratios[name] = counters.get(hits, 0) / total if total else 0.0
+        return {'counters': counters, 'gauges': gauges, 'ratios': ratios}
+
+
+# Process-wide registry
+metrics = Metrics()
@@ -2,31 +2,195 @@
 Assessment Recommendation Engine
 Uses semantic similarity and LLM for intelligent recommendations
 """
+import hashlib
 import json
 import numpy as np
-from typing import List, Dict, Optional
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import google.generativeai as genai
+import queue
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import List, Dict, Optional, Tuple
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+from cache import SemanticCache, TTLCache, canonical_query
+from chunking import sentence_windows, split_clauses
+from catalog import FIELDS, Catalog, iter_json_records, load_arrow
+from encoders import encode_parallel, load_encoder, load_query_encoder
+from lexical import BM25Index
+from metrics import metrics
+from responses import build_fragment
+from skills import SkillIndex
+from snapshot import (StringColumn, catalog_arrays, catalog_from_arrays, pack_strings,
+                      read_snapshot, write_snapshot)
+from terms import TermTable
+
+
+metrics.register_ratio('page_cache_hit_rate', 'page_cache_hits', 'page_cache_misses')
+metrics.register_ratio('term_fastpath_hit_rate', 'term_fastpath_hits', 'term_fastpath_misses')
+
+
+# Requirement keywords per test type
+# Technical skills (Knowledge & Skills - K)
+TECH_KEYWORDS = ['java', 'python', 'sql', 'javascript', 'programming', 
+                 'coding', 'technical', 'developer', 'engineer', 'software',
+                 'database', 'web', 'frontend', 'backend', 'fullstack',
+                 'react', 'node', 'angular', 'vue', 'django', 'flask',
+                 'c++', 'c#', 'ruby', 'php', 'go', 'rust', 'kotlin', 'swift']
+
+# Behavioral skills (Personality & Behavior - P)
+BEHAVIORAL_KEYWORDS = ['collaborate', 'collaboration', 'teamwork', 'team', 
+                       'communication', 'leadership', 'leader', 'personality', 
+                       'behavior', 'interpersonal', 'social', 'management',
+                       'manage', 'motivate', 'inspire', 'influence']
+
+# Cognitive/Ability (Ability & Aptitude - A)
+COGNITIVE_KEYWORDS = ['cognitive', 'analytical', 'problem-solving', 'reasoning',
+                      'logic', 'critical thinking', 'aptitude', 'ability',
+                      'numerical', 'verbal', 'abstract', 'spatial']
+
+# Competencies (C)
+COMPETENCY_KEYWORDS = ['competenc', 'skill', 'strategic', 'planning',
+                       'decision', 'judgment', 'professional']
+
+REQUIREMENT_KEYWORDS = TECH_KEYWORDS + BEHAVIORAL_KEYWORDS + COGNITIVE_KEYWORDS + COMPETENCY_KEYWORDS
+
+# Full assessment names added to the term table, within TERM_FASTPATH_MAX_TERMS
+MAX_NAME_TERMS = 10000
+
+# Requirement clauses scored separately per query; extra clauses are merged
+MAX_CLAUSES = 6
+
+
+@dataclass
+class Ranking:
+    """One page of ranked assessment indices"""
+    indices: List[int]
+    scores: List[float]
+    total: int
+    degraded: bool = False  # answered by the lexical index, not the encoder
+    engine: str = 'dense'   # 'dense' or 'lexical'
+    matched_skills: Optional[List[List[str]]] = None  # query skills each result lists
+
+
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc', '.parquet')
+
+
+def parse_field_weights(weights) -> Optional[Tuple[float, ...]]:
+    """
+    Normalized weights in FIELDS order from a {field: weight} dict or a
+    'name=0.2,skills=0.5' string; omitted fields weigh 0, empty means None
+    """
+    if not weights:
+        return None
+    if isinstance(weights, str):
+        pairs = (item.split('=', 1) for item in weights.split(',') if item.strip())
+        weights = {field.strip(): float(value) for field, value in pairs}
+    unknown = set(weights) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}; expected {list(FIELDS)}")
+    values = [float(weights.get(field, 0.0)) for field in FIELDS]
+    if min(values) < 0 or sum(values) <= 0:
+        raise ValueError("Field weights must be non-negative with a positive sum")
+    total = sum(values)
+    return tuple(round(v / total, 6) for v in values)
 
 
 class AssessmentRecommender:
     def __init__(self, assessments_path: str = None):
+        # dense: transformer embeddings; lite: BM25 only, never imports torch
+        self.mode = os.getenv('RECOMMENDER_MODE', 'dense').lower()
+        if self.mode not in ('dense', 'lite'):
+            raise ValueError(f"Unknown RECOMMENDER_MODE: {self.mode}")
+        # Serve BM25 while the dense index builds on a background thread
+        self.progressive = self.mode == 'dense' and os.getenv('PROGRESSIVE_STARTUP') == '1'
+        self.engine = 'lexical' if self.mode == 'lite' or self.progressive else 'dense'
+        self.dense_ready_at = None  # seconds from construction to the dense switch
+        self._started = time.perf_counter()
         self.model = None
+        self.query_encoder = None
+        self.term_table = None
+        self.lexical_index = None
+        self.skill_index = None
+        # Weight of skill overlap (share of query skills an assessment lists)
+        # added to the similarity score (0 = reported, not ranked on)
+        self.skill_weight = float(os.getenv('SKILL_OVERLAP_WEIGHT', 0.1))
+        self._encode_ms = None  # running average of model query encodes
+        self._encodes_in_flight = 0
+        self._encode_lock = threading.Lock()
+        # Answer from BM25 when queue wait or encoder backlog exceeds this (0 = never)
+        self.degrade_wait_ms = float(os.getenv('DEGRADE_QUEUE_WAIT_MS', 0))
+        self.model_name = os.getenv('EMBEDDING_MODEL', 'paraphrase-MiniLM-L3-v2')
+        self.embeddings = None
+        self.response_fragments = []
+        # Matryoshka first pass: score a renormalized prefix of each embedding,
+        # then rescore the best PREFIX_RESCORE rows with full vectors (0 = off)
+        self.prefix_dims = int(os.getenv('PREFIX_DIMS', 0))
+        self.prefix_rescore = int(os.getenv('PREFIX_RESCORE', 200))
+        self.prefix_embeddings = None
+        # Field-weighted scoring: one embedding matrix per catalog field, and
+        # the weights used when a request does not pass its own (None = off)
+        self.field_weights = parse_field_weights(os.getenv('FIELD_WEIGHTS', ''))
+        self.field_embeddings = None  # (len(FIELDS), assessments, dim)
+        # Long queries: encode overlapping sentence windows of at most
+        # QUERY_CHUNK_WORDS words and pool their scores per assessment
+        self.chunk_words = int(os.getenv('QUERY_CHUNK_WORDS', 64))
+        self.chunk_overlap = int(os.getenv('QUERY_CHUNK_OVERLAP', 1))
+        self.chunk_pooling = os.getenv('QUERY_CHUNK_POOLING', 'max').lower()
+        if self.chunk_pooling not in ('max', 'mean'):
+            raise ValueError(f"Unknown QUERY_CHUNK_POOLING: {self.chunk_pooling}")
+        # Score each requirement clause of a query on its own as well, and
+        # give every clause a share of the top slots
+        self.decompose = os.getenv('QUERY_DECOMPOSITION') == '1'
 
+        # Full score vectors per query, so follow-up pages skip encode + matmul
+        self._score_cache = TTLCache(
+            maxsize=int(os.getenv('SCORE_CACHE_SIZE', 64)),
+            ttl=float(os.getenv('SCORE_CACHE_TTL', 300))
+        )
         
-        # Smart path resolution for different environments
-        if assessments_path is None:
-            assessments_path = self._find_assessments_file()
+        # Query embeddings keyed by (model id, canonical query)
+        self._embedding_cache = TTLCache(
+            maxsize=int(os.getenv('QUERY_CACHE_SIZE', 4096)),
+            ttl=float(os.getenv('QUERY_CACHE_TTL', 3600)),
+            maxbytes=int(float(os.getenv('QUERY_CACHE_MAX_MB', 16)) * 1024 * 1024),
+            sizeof=lambda vector: vector.nbytes,
+            name='query_embedding_cache'
+        )
         
-        self.assessments = self._load_assessments(assessments_path)
-        self.embeddings = None
+        # Optional: reuse rankings of near-duplicate queries
+        semantic_distance = float(os.getenv('SEMANTIC_CACHE_DISTANCE', 0))
+        self._semantic_cache = None
+        if semantic_distance > 0:
+            self._semantic_cache = SemanticCache(
+                capacity=int(os.getenv('SEMANTIC_CACHE_SIZE', 256)),
+                max_distance=semantic_distance,
+                name='semantic_cache'
+            )
+        # Query whose ranking a semantically served first page came from,
+        # keyed like the score cache, so later pages continue that ranking
+        self._page_sources = TTLCache(
+            maxsize=int(os.getenv('QUERY_CACHE_SIZE', 4096)),
+            ttl=float(os.getenv('QUERY_CACHE_TTL', 3600))
+        )
+        
+        # A snapshot of a previously built index replaces loading and encoding
+        snapshot_path = os.getenv('SNAPSHOT_PATH')
+        restored = bool(snapshot_path) and os.path.exists(snapshot_path) and \
+            self._restore_snapshot(snapshot_path, assessments_path)
+        if not restored:
+            # Smart path resolution for different environments
+            if assessments_path is None:
+                assessments_path = self._find_assessments_file()
+            
+            self.assessments_path = assessments_path
+            self.assessments = self._load_assessments(assessments_path)
+        self.index_version = None
         
         # Initialize Gemini API
         api_key = os.getenv('GEMINI_API_KEY')
         if api_key:
+            import google.generativeai as genai
             genai.configure(api_key=api_key)
             self.llm = genai.GenerativeModel('gemini-pro')
         else:
@@ -35,7 +199,14 @@ class AssessmentRecommender:
         self._build_index()
     
     def _find_assessments_file(self) -> str:
-        """Find assessments.json in multiple possible locations"""
+        """
+        Find assessments.json in multiple possible locations.
+        CATALOG_PATH overrides the search, and an assessments.arrow file next
+        to the JSON (and at least as new) is preferred over it.
+        """
+        if os.getenv('CATALOG_PATH'):
+            return os.getenv('CATALOG_PATH')
+        
         possible_paths = [
             'data/assessments.json',      # Render deployment (backend/data/)
             '../data/assessments.json',   # Local development
@@ -44,6 +215,13 @@ class AssessmentRecommender:
         ]
         
         for path in possible_paths:
+            arrow_path = os.path.splitext(path)[0] + '.arrow'
+            if os.path.exists(arrow_path) and (
+                not os.path.exists(path)
+                or os.path.getmtime(arrow_path) >= os.path.getmtime(path)
+            ):
+                print(f"✓ Found assessments at: {arrow_path}")
+                return arrow_path
             if os.path.exists(path):
                 print(f"✓ Found assessments at: {path}")
                 return path
@@ -51,19 +229,128 @@ class AssessmentRecommender:
         print("⚠ Warning: assessments.json not found in any location. Using sample data.")
         return 'data/assessments.json'  # Default fallback
     
-    def _load_assessments(self, path: str) -> List[Dict]:
-        """Load assessments from JSON file"""
+    def _load_assessments(self, path: str) -> Catalog:
+        """Load assessments from JSON file into a columnar catalog"""
+        if path.endswith(ARROW_EXTENSIONS):
+            return self._load_arrow(path)
+        
+        streaming = path.endswith('.jsonl') or os.getenv('CATALOG_STREAMING') == '1'
+        if streaming and os.path.exists(path):
+            return self._load_streaming(path)
+        
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 print(f"✓ Loaded {len(data)} assessments from {path}")
-                return data
+                return Catalog.from_records(data)
         except FileNotFoundError:
             print(f"⚠ Warning: {path} not found. Using sample data.")
-            return self._get_sample_assessments()
+            return Catalog.from_records(self._get_sample_assessments())
         except Exception as e:
             print(f"⚠ Error loading {path}: {e}. Using sample data.")
-            return self._get_sample_assessments()
+            return Catalog.from_records(self._get_sample_assessments())
+    
+    def _load_arrow(self, path: str) -> Catalog:
+        """Memory-map an Arrow catalog, reusing its embeddings when the model matches"""
+        catalog, embeddings, fragments, metadata, indexes = load_arrow(path)
+        print(f"✓ Mapped {len(catalog)} assessments from {path}")
+        
+        self.response_fragments = fragments
+        if 'term_vectors' in indexes and metadata.get('model_name') == self.model_name \
+                and os.getenv('TERM_FASTPATH', '1') == '1':
+            self.term_table = TermTable.from_arrays(
+                indexes['terms'], indexes['term_vectors'],
+                max_query_tokens=int(os.getenv('TERM_FASTPATH_MAX_TOKENS', 6))
+            )
+        if 'skill_indptr' in indexes:
+            indices = indexes['skill_indices']
+            self.skill_index = SkillIndex.from_arrays(
+                indexes['skill_vocabulary'], np.ones(len(indices), dtype=np.float32),
+                indices, indexes['skill_indptr'], len(catalog)
+            )
+        if metadata.get('model_name') == self.model_name:
+            self.embeddings = embeddings
+        elif self.mode == 'dense':
+            print(f"⚠ {path} was built with {metadata.get('model_name')}, "
+                  f"re-encoding with {self.model_name}")
+        return catalog
+    
+    def _load_streaming(self, path: str) -> Catalog:
+        """
+        Parse, validate and encode the catalog chunk by chunk.
+        A reader thread parses records into a bounded queue while this thread
+        encodes the previous chunk, so parsed-but-unindexed records never
+        exceed a few chunks regardless of catalog size.
+        """
+        chunk_size = int(os.getenv('CATALOG_CHUNK_SIZE', 1024))
+        chunks = queue.Queue(maxsize=2)
+        done = object()
+        
+        def reader():
+            try:
+                chunk = []
+                for record in iter_json_records(path):
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        chunks.put(chunk)
+                        chunk = []
+                if chunk:
+                    chunks.put(chunk)
+                chunks.put(done)
+            except Exception as e:
+                chunks.put(e)
+        
+        encode = self.mode == 'dense' and not self.progressive
+        if encode:
+            self._load_model()
+        catalog = Catalog()
+        embeddings = None
+        count = skipped = 0
+        
+        thread = threading.Thread(target=reader, name='catalog-reader', daemon=True)
+        thread.start()
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            
+            valid = [r for r in chunk if r.get('name') and r.get('url')]
+            skipped += len(chunk) - len(valid)
+            if not valid:
+                continue
+            
+            start = len(catalog)
+            catalog.extend(valid)
+            if not encode:
+                continue
+            vectors = self._normalize(self.model.encode(
+                [catalog.index_text(i) for i in range(start, len(catalog))]
+            ))
+            
+            # Grow the matrix geometrically instead of stacking every chunk;
+            # resize reallocates in place, so no second copy is held
+            if embeddings is None:
+                embeddings = np.empty((max(chunk_size, len(vectors)), vectors.shape[1]), dtype=np.float32)
+            rows = len(embeddings)
+            while count + len(vectors) > rows:
+                rows *= 2
+            if rows > len(embeddings):
+                embeddings.resize((rows, embeddings.shape[1]), refcheck=False)
+            embeddings[count:count + len(vectors)] = vectors
+            count += len(vectors)
+        thread.join()
+        
+        catalog.finish()
+        if embeddings is not None:
+            embeddings.resize((count, embeddings.shape[1]), refcheck=False)
+        self.embeddings = embeddings
+        message = f"✓ Streamed {len(catalog)} assessments from {path}"
+        if skipped:
+            message += f" (skipped {skipped} without name/url)"
+        print(message)
+        return catalog
     
     def _get_sample_assessments(self) -> List[Dict]:
         """Sample assessments for testing"""
@@ -84,92 +371,615 @@ class AssessmentRecommender:
             }
         ]
 
+    def _load_model(self):
+        """Load the query/catalog encoder (backend chosen by ENCODER_BACKEND)"""
+        if self.model is None:
+            self.model = load_encoder(self.model_name)
+            self.query_encoder = load_query_encoder(self.model)
+
     def _build_index(self):
         """Build embeddings index for all assessments"""
-        if self.model is None:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer('paraphrase-MiniLM-L3-v2')
+        self._score_cache.clear()
+        self._embedding_cache.clear()
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+        self._page_sources.clear()
 
-        texts = [
-            f"{a['name']} {a['description']} {' '.join(a.get('skills', []))}"
-            for a in self.assessments
-        ]
-        self.embeddings = self.model.encode(texts, convert_to_numpy=True)
+        # API payloads never change for a fixed catalog; encode them once
+        if len(self.response_fragments) != len(self.assessments):
+            self.response_fragments = [build_fragment(record) for record in self.assessments]
+
+        needs_lexical = self.mode == 'lite' or self.progressive or self.degrade_wait_ms > 0
+        if needs_lexical and self.lexical_index is None:
+            self.lexical_index = BM25Index(
+                self.assessments.index_text(i) for i in range(len(self.assessments))
+            )
 
+        if self.skill_index is None:
+            self.skill_index = SkillIndex(self.assessments.skills, keywords=REQUIREMENT_KEYWORDS)
 
-    def recommend(self, query: str, top_k: int = 10) -> List[Dict]:
+        if self.progressive:
+            threading.Thread(target=self._build_dense_index, name='dense-index', daemon=True).start()
+        elif self.mode == 'dense':
+            self._build_dense_index()
+
+        self.index_version = self._compute_index_version()
+
+    def _build_dense_index(self):
+        """Load the encoder and embed the catalog, then switch rank() to it"""
+        try:
+            self._load_model()
+            # Embeddings may already exist from loading (Arrow or streaming catalog)
+            if self.embeddings is None:
+                # Normalize once so cosine similarity is a single matmul per query
+                self.embeddings = self._normalize(self._encode_catalog(
+                    [self.assessments.index_text(i) for i in range(len(self.assessments))]
+                ))
+            self._build_prefix_index()
+            if self.field_weights is not None and self.field_embeddings is None:
+                self._build_field_index()
+
+            if os.getenv('TERM_FASTPATH', '1') == '1' and self.term_table is None:
+                self._build_term_table()
+        except Exception as e:
+            if not self.progressive:
+                raise
+            print(f"❌ Dense index failed, staying on lexical ranking: {e}")
+            return
+
+        # Flip the engine only once everything it reads is in place; the
+        # version changes after it, so no lexical page is cached as dense
+        self.engine = 'dense'
+        self.index_version = self._compute_index_version()
+        if self.progressive:
+            self.dense_ready_at = time.perf_counter() - self._started
+            metrics.set_gauge('dense_index_ready_s', round(self.dense_ready_at, 3))
+            print(f"✓ Switched from lexical to dense ranking after {self.dense_ready_at:.2f}s")
+
+    def _encode_catalog(self, texts: List[str]) -> np.ndarray:
+        """Embed catalog texts in-process or on INDEX_WORKERS processes"""
+        workers = int(os.getenv('INDEX_WORKERS', 1))
+        batch_size = int(os.getenv('INDEX_BATCH_SIZE', 32))
+        if workers > 1:
+            return encode_parallel(self.model_name, texts, workers, batch_size,
+                                   lengths=self.model.token_lengths(texts))
+        return self.model.encode(texts, batch_size=batch_size)
+
+    def _build_field_index(self):
         """
-        Recommend assessments based on query
-        Returns balanced recommendations across test types
+        Embed every non-empty field in one batch into a contiguous
+        (fields, assessments, dim) array; empty fields stay zero vectors
         """
-        # Get semantic similarity scores
-        query_embedding = self.model.encode([query])
-        similarities = cosine_similarity(query_embedding, self.embeddings)[0]
-        
+        n = len(self.assessments)
+        slots, texts = [], []
+        for f, field in enumerate(FIELDS):
+            for idx in range(n):
+                text = self.assessments.field_text(idx, field)
+                if text.strip():
+                    slots.append(f * n + idx)
+                    texts.append(text)
+
+        matrix = np.zeros((len(FIELDS) * n, self.embeddings.shape[1]), dtype=np.float32)
+        if texts:
+            matrix[slots] = self._normalize(self._encode_catalog(texts))
+        self.field_embeddings = matrix.reshape(len(FIELDS), n, -1)
+        print(f"✓ Field index: {', '.join(FIELDS)} ({len(texts)} texts)")
+
+    def _source_stat(self, path: str) -> Dict:
+        stat = os.stat(path)
+        return {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def save_snapshot(self, path: str):
+        """
+        Write the built index (catalog columns, embeddings, response fragments,
+        term table and BM25 index) to one file for _restore_snapshot
+        """
+        if self.mode == 'dense' and self.engine != 'dense':
+            raise RuntimeError("Dense index is still building")
+        if self.lexical_index is None:
+            self.lexical_index = BM25Index(
+                self.assessments.index_text(i) for i in range(len(self.assessments))
+            )
+
+        arrays = catalog_arrays(self.assessments)
+        arrays['fragments_offsets'], arrays['fragments_blob'] = pack_strings(self.response_fragments)
+        matrix = self.lexical_index.matrix
+        arrays['bm25_data'], arrays['bm25_indices'], arrays['bm25_indptr'] = \
+            matrix.data, matrix.indices, matrix.indptr
+        arrays['bm25_vocab_offsets'], arrays['bm25_vocab_blob'] = pack_strings(list(self.lexical_index.vocabulary))
+        matrix = self.skill_index.matrix
+        arrays['skill_data'], arrays['skill_indices'], arrays['skill_indptr'] = \
+            matrix.data, matrix.indices, matrix.indptr
+        arrays['skill_vocab_offsets'], arrays['skill_vocab_blob'] = pack_strings(self.skill_index.skills())
+        if self.embeddings is not None:
+            arrays['embeddings'] = self.embeddings
+        if self.field_embeddings is not None:
+            arrays['field_embeddings'] = self.field_embeddings
+        if self.term_table is not None:
+            arrays['terms_offsets'], arrays['terms_blob'] = pack_strings(self.term_table.terms())
+            arrays['term_vectors'] = self.term_table.vectors
+
+        source = None
+        if os.path.exists(self.assessments_path):
+            source = self._source_stat(self.assessments_path)
+        write_snapshot(path, arrays, {
+            'model_name': self.model_name,
+            'type_table': self.assessments.type_table,
+            'source': source
+        })
+        print(f"✓ Wrote snapshot of {len(self.assessments)} assessments to {path}")
+
+    def _restore_snapshot(self, path: str, assessments_path: Optional[str]) -> bool:
+        """Memory-map a snapshot written by save_snapshot, if it is still current"""
+        try:
+            arrays, meta = read_snapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring snapshot {path}: {e}")
+            return False
+
+        source = meta['source'] or {}
+        source_path = source.get('path')
+        if self.mode == 'dense' and (meta['model_name'] != self.model_name or 'embeddings' not in arrays):
+            print(f"⚠ Snapshot {path} was built with {meta['model_name']}, rebuilding")
+            return False
+        if assessments_path is not None and assessments_path != source_path:
+            return False
+        if source_path and os.path.exists(source_path) and self._source_stat(source_path) != source:
+            print(f"⚠ {source_path} changed since snapshot {path}, rebuilding")
+            return False
+
+        self.assessments_path = source_path or path
+        self.assessments = catalog_from_arrays(arrays, meta['type_table'])
+        self.response_fragments = StringColumn(
+            arrays['fragments_offsets'], arrays['fragments_blob'], decode=False
+        )
+        self.lexical_index = BM25Index.from_arrays(
+            list(StringColumn(arrays['bm25_vocab_offsets'], arrays['bm25_vocab_blob'])),
+            arrays['bm25_data'], arrays['bm25_indices'], arrays['bm25_indptr'], len(self.assessments)
+        )
+        if 'skill_indptr' in arrays:
+            self.skill_index = SkillIndex.from_arrays(
+                list(StringColumn(arrays['skill_vocab_offsets'], arrays['skill_vocab_blob'])),
+                arrays['skill_data'], arrays['skill_indices'], arrays['skill_indptr'], len(self.assessments)
+            )
+        if self.mode == 'dense':
+            self.embeddings = arrays['embeddings']
+            if 'field_embeddings' in arrays and self.field_weights is not None:
+                self.field_embeddings = arrays['field_embeddings']
+            if 'term_vectors' in arrays and os.getenv('TERM_FASTPATH', '1') == '1':
+                self.term_table = TermTable.from_arrays(
+                    list(StringColumn(arrays['terms_offsets'], arrays['terms_blob'])),
+                    arrays['term_vectors'],
+                    max_query_tokens=int(os.getenv('TERM_FASTPATH_MAX_TOKENS', 6))
+                )
+        print(f"✓ Restored {len(self.assessments)} assessments from snapshot {path}")
+        return True
+
+    def _compute_index_version(self) -> str:
+        """
+        Identifies the catalog file, encoders and ranking settings behind this
+        index, so caches keyed on it (including restored cache snapshots) are
+        invalidated whenever the catalog is reloaded or the config changes
+        """
+        engine = self.query_encoder.model_id if self.engine == 'dense' else 'lexical:bm25'
+        parts = [engine, str(len(self.assessments)), str(self.assessments_path)]
+        parts.append(f"skills:{self.skill_weight}")
+        if self.engine == 'dense':
+            if self.field_weights is not None:
+                parts.append(f"fields:{self.field_weights}")
+            parts.append(f"prefix:{self.prefix_dims}/{self.prefix_rescore}")
+            parts.append(f"chunks:{self.chunk_words}/{self.chunk_overlap}/{self.chunk_pooling}")
+            parts.append(f"decompose:{self.decompose}")
+        if os.path.exists(self.assessments_path):
+            stat = os.stat(self.assessments_path)
+            parts += [str(stat.st_size), str(stat.st_mtime_ns)]
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+    def _build_prefix_index(self):
+        """Renormalized leading prefix_dims columns of the embeddings, if enabled"""
+        dims = self.prefix_dims
+        if dims <= 0 or dims >= self.embeddings.shape[1]:
+            self.prefix_embeddings = None
+            return
+        self.prefix_embeddings = self._normalize(self.embeddings[:, :dims])
+        print(f"✓ Prefix index: {dims} of {self.embeddings.shape[1]} dims, "
+              f"rescoring {self.prefix_rescore} candidates")
+
+    def _build_term_table(self):
+        """
+        Embed catalog vocabulary for the keyword-only query fast path: all
+        requirement keywords, then the most frequent skills and name words,
+        then full names, until TERM_FASTPATH_MAX_TERMS terms are reached
+        """
+        max_terms = int(os.getenv('TERM_FASTPATH_MAX_TERMS', 20000))
+        counts = Counter()
+        for skills in self.assessments.skills:
+            counts.update(set(skills))
+        for idx in range(len(self.assessments)):
+            counts.update(set(self.assessments.names[idx].split()))
+
+        terms = dict.fromkeys(REQUIREMENT_KEYWORDS)
+        for term, _ in counts.most_common(max(max_terms - len(terms), 0)):
+            terms[term] = None
+        for idx in range(min(len(self.assessments), MAX_NAME_TERMS)):
+            if len(terms) >= max_terms:
+                break
+            terms[self.assessments.names[idx]] = None
+
+        self.term_table = TermTable(
+            sorted(terms), self.model,
+            max_query_tokens=int(os.getenv('TERM_FASTPATH_MAX_TOKENS', 6))
+        )
+        print(f"✓ Term table: {len(self.term_table)} terms")
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows as float32"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def resolve_field_weights(self, weights=None) -> Optional[Tuple[float, ...]]:
+        """
+        Normalized per-request field weights, or the FIELD_WEIGHTS default
+        when none are given; a tuple is taken as already resolved.
+        Raises ValueError if the weights cannot be applied.
+        """
+        if not weights:
+            return self.field_weights
+        if self.field_weights is None:
+            raise ValueError("Field weights need FIELD_WEIGHTS set on the server")
+        if isinstance(weights, tuple):
+            return weights
+        return parse_field_weights(weights)
+
+    def _similarity(self, query_embedding: np.ndarray,
+                    field_weights: Optional[Tuple[float, ...]] = None) -> np.ndarray:
+        """
+        Full-vector cosine similarity for one query vector (assessments,) or
+        a stack of them (assessments x queries), in one matmul. With field
+        weights the query is scored against every field matrix at once and
+        the per-field scores are mixed by the weights.
+        """
+        if field_weights is not None and self.field_embeddings is not None:
+            fields, n, dim = self.field_embeddings.shape
+            per_field = self.field_embeddings.reshape(fields * n, dim) @ query_embedding.T
+            per_field = per_field.reshape((fields, n) + per_field.shape[1:])
+            return np.tensordot(np.asarray(field_weights, dtype=np.float32), per_field, axes=1)
+        return self.embeddings @ query_embedding.T
+
+    def _score(self, query_embedding: np.ndarray,
+               field_weights: Optional[Tuple[float, ...]] = None) -> np.ndarray:
+        """
+        Cosine similarity of a normalized query against every assessment.
+        A 2-D query holds the sentence windows of a long query; their scores
+        are max- or mean-pooled per assessment (QUERY_CHUNK_POOLING).
+        With a prefix index the first pass reads only prefix_dims columns;
+        the prefix_rescore best rows get their full-vector score and the
+        rest are shifted below them, keeping their prefix order.
+        """
+        if query_embedding.ndim == 2:
+            scores = self._similarity(query_embedding, field_weights)
+            return scores.max(axis=1) if self.chunk_pooling == 'max' else scores.mean(axis=1)
+
+        if self.prefix_embeddings is None or field_weights is not None:
+            return self._similarity(query_embedding, field_weights)
+
+        dims = self.prefix_embeddings.shape[1]
+        scores = self.prefix_embeddings @ self._normalize(query_embedding[:dims])
+        shortlist = self._top_indices(scores, self.prefix_rescore)
+        if len(shortlist) == 0:
+            return scores
+        full = self.embeddings[shortlist] @ query_embedding
+        # shortlist is best-first, so its last prefix score bounds the rest
+        scores -= max(0.0, float(scores[shortlist[-1]] - full.min()))
+        scores[shortlist] = full
+        return scores
+
+    def _encode_query(self, query: str, queue_wait_ms: float = 0.0) -> Optional[np.ndarray]:
+        """
+        Embedding of a canonical query, from the cache when possible.
+        None when only an encoder forward pass could produce it and the
+        degradation policy says the encoder is saturated.
+        """
+        key = (self.query_encoder.model_id, query)
+        embedding = self._embedding_cache.get(key)
+        if embedding is None:
+            embedding = self._compute_query_embedding(query, queue_wait_ms)
+            if embedding is not None:
+                self._embedding_cache.put(key, embedding)
+        return embedding
+
+    def _should_degrade(self, queue_wait_ms: float) -> bool:
+        """True when the request waited too long or the encoder backlog is too deep"""
+        if self.degrade_wait_ms <= 0 or self.lexical_index is None:
+            return False
+        backlog_ms = self._encodes_in_flight * (self._encode_ms or 0.0)
+        return max(queue_wait_ms, backlog_ms) >= self.degrade_wait_ms
+
+    def _compute_query_embedding(self, query: str, queue_wait_ms: float = 0.0) -> Optional[np.ndarray]:
+        """
+        Compose from cached term vectors when possible, else run the encoder.
+        A query longer than chunk_words becomes a (windows x dim) matrix.
+        """
+        start = time.perf_counter()
+        windows = sentence_windows(query, self.chunk_words, self.chunk_overlap)
+        if self.term_table is not None and len(windows) == 1:
+            composed = self.term_table.compose(query)
+            if composed is not None:
+                if self._encode_ms is not None:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    saved_us = max(0.0, self._encode_ms - elapsed_ms) * 1000
+                    metrics.incr('term_fastpath_saved_us', int(saved_us))
+                metrics.incr('term_fastpath_hits')
+                return composed
+            metrics.incr('term_fastpath_misses')
+
+        if self._should_degrade(queue_wait_ms):
+            return None
+        embeddings = self._run_encoder(windows)
+        if len(windows) == 1:
+            return embeddings[0]
+        metrics.incr('chunked_queries')
+        metrics.incr('query_chunks', len(windows))
+        return embeddings
+
+    def _run_encoder(self, texts: List[str]) -> np.ndarray:
+        """One batched forward pass, counted in the backlog _should_degrade reads"""
+        start = time.perf_counter()
+        with self._encode_lock:
+            self._encodes_in_flight += 1
+        try:
+            embeddings = self.query_encoder.encode(texts)
+        finally:
+            with self._encode_lock:
+                self._encodes_in_flight -= 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._encode_ms = elapsed_ms if self._encode_ms is None else 0.9 * self._encode_ms + 0.1 * elapsed_ms
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _requirement_clauses(self, query: str) -> List[str]:
+        """
+        Parts of the query that each name a requirement (a keyword hit in
+        _extract_requirements); text without one joins the next clause, or
+        the last one at the end. Empty unless there are at least two.
+        """
+        clauses, pending = [], []
+        for part in split_clauses(query):
+            pending.append(part)
+            if self._extract_requirements(part)['test_types_needed']:
+                clauses.append(' '.join(pending))
+                pending = []
+        if pending and clauses:
+            clauses[-1] = ' '.join([clauses[-1]] + pending)
+        if len(clauses) > MAX_CLAUSES:
+            clauses[MAX_CLAUSES - 1:] = [' '.join(clauses[MAX_CLAUSES - 1:])]
+        return clauses if len(clauses) > 1 else []
+
+    def _encode_clauses(self, clauses: List[str], queue_wait_ms: float = 0.0) -> Optional[np.ndarray]:
+        """
+        Normalized (clauses x dim) embeddings, reusing the query embedding
+        cache; the misses are encoded in one batch. None when degraded.
+        """
+        model_id = self.query_encoder.model_id
+        vectors = [self._embedding_cache.get((model_id, clause)) for clause in clauses]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            if self._should_degrade(queue_wait_ms):
+                return None
+            encoded = self._run_encoder([clauses[i] for i in missing])
+            for i, vector in zip(missing, encoded):
+                self._embedding_cache.put((model_id, clauses[i]), vector)
+                vectors[i] = vector
+        return self._normalize(np.stack(vectors))
+
+    @staticmethod
+    def _clause_candidates(clause_scores: np.ndarray, top_indices: np.ndarray,
+                           top_k: int) -> np.ndarray:
+        """
+        Candidate order that covers every clause: each clause's best match,
+        then each clause's second best, and so on, followed by the
+        whole-query candidates. Balancing fills its slots in this order.
+        """
+        k = min(top_k, clause_scores.shape[1])
+        picks = np.argpartition(-clause_scores, k - 1, axis=1)[:, :k]
+        picked = np.take_along_axis(clause_scores, picks, axis=1)
+        picks = np.take_along_axis(picks, np.lexsort((picks, -picked), axis=1), axis=1)
+        order = np.concatenate([picks.T.ravel(), top_indices])
+        _, first = np.unique(order, return_index=True)
+        return order[np.sort(first)]
+
+    @staticmethod
+    def _top_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, best first, via partial selection.
+        Ties are broken by index, so a smaller k is always a prefix of a
+        larger one and pages stay consistent even with many equal scores.
+        """
+        n = len(similarities)
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < n:
+            kth = np.partition(similarities, n - k)[n - k]
+            above = np.flatnonzero(similarities > kth)
+            ties = np.flatnonzero(similarities == kth)[:k - len(above)]
+            candidates = np.sort(np.concatenate([above, ties]))
+        else:
+            candidates = np.arange(n)
+        return candidates[np.argsort(-similarities[candidates], kind='stable')]
+
+    def can_rank(self, engine: str) -> bool:
+        """Whether pages can still be ranked by engine (named in a cursor)"""
+        if engine == 'lexical':
+            return self.lexical_index is not None
+        return engine == 'dense' and self.engine == 'dense'
+
+    def rank(self, query: str, top_k: int = 10, offset: int = 0,
+             queue_wait_ms: float = 0.0, field_weights=None, engine: Optional[str] = None) -> Ranking:
+        """
+        Rank assessments for a query and return one page of indices.
+        The ranking is the type-balanced top_k followed by the remaining
+        assessments in score order; offset selects the page within it.
+        queue_wait_ms is how long the request waited for admission; under
+        pressure the page is ranked by BM25 instead (see _should_degrade).
+        field_weights overrides FIELD_WEIGHTS for dense scoring. engine pins
+        the ranking to the engine of an earlier page (see Ranking.engine), so
+        later pages continue it after a degraded page or an engine switch.
+        """
+        weights = self.resolve_field_weights(field_weights)
+        engine = engine or self.engine
+        source = self._page_sources.get((engine, canonical_query(query), weights))
+        if source is None:
+            return self._rank(query, top_k, offset, queue_wait_ms, weights, engine)
+
+        # Page 1 was a near-duplicate's page; every page follows its ranking
+        ranking = self._rank(source, top_k, offset, queue_wait_ms, weights, engine, semantic=False)
+        skill_columns = self._extract_requirements(query)['skill_columns']
+        return replace(ranking, matched_skills=self.skill_index.matched(ranking.indices, skill_columns))
+
+    def _rank(self, query: str, top_k: int, offset: int, queue_wait_ms: float,
+              weights: Optional[Tuple[float, ...]], engine: str, semantic: bool = True) -> Ranking:
+        """One page of the ranking for query by engine; see rank()"""
+        key = canonical_query(query)
+        score_key = (engine, key, weights)
+        similarities = self._score_cache.get(score_key)
+        if offset > 0:
+            metrics.incr('page_cache_hits' if similarities is not None else 'page_cache_misses')
+
+        query_embedding = None
+        if similarities is None and engine == 'lexical':
+            similarities = self.lexical_index.score(key)
+            self._score_cache.put(score_key, similarities)
+        elif similarities is None:
+            query_embedding = self._encode_query(key, queue_wait_ms)
+            if query_embedding is None:
+                # Encoder saturated: keyword scores, cached under the lexical
+                # engine that the page's cursor names
+                engine = 'lexical'
+                metrics.incr('degraded_responses')
+                similarities = self.lexical_index.score(key)
+                self._score_cache.put((engine, key, weights), similarities)
+            else:
+                query_embedding = self._normalize(query_embedding)
+                # First pages of near-duplicate queries share a ranking; long
+                # queries (window stacks) are not matched semantically
+                use_semantic = semantic and self._semantic_cache is not None \
+                    and query_embedding.ndim == 1 and offset == 0
+                if use_semantic:
+                    cached = self._semantic_cache.lookup(query_embedding, (top_k, weights))
+                    if cached is not None:
+                        ranking, source = cached
+                        self._page_sources.put(score_key, source)
+                        skill_columns = self._extract_requirements(query)['skill_columns']
+                        return replace(
+                            ranking, matched_skills=self.skill_index.matched(ranking.indices, skill_columns)
+                        )
+                similarities = self._score(query_embedding, weights)
+                clauses = self._requirement_clauses(key) if self.decompose else []
+                clause_embeddings = self._encode_clauses(clauses, queue_wait_ms) if clauses else None
+                if clause_embeddings is not None:
+                    # Row 0 scores the whole query, then one row per clause
+                    clause_scores = self._similarity(clause_embeddings, weights).T
+                    similarities = np.vstack([similarities, clause_scores])
+                    metrics.incr('decomposed_queries')
+                self._score_cache.put(score_key, similarities)
+
+        clause_scores = None
+        if similarities.ndim == 2:
+            similarities, clause_scores = similarities[0], similarities[1:]
+
+        # Extract query requirements
+        requirements = self._extract_requirements(query)
+        skill_columns = requirements['skill_columns']
+        if self.skill_weight > 0 and len(skill_columns):
+            # One sparse mat-vec over the assessment x skill matrix
+            similarities = similarities + self.skill_weight * self.skill_index.overlap(skill_columns)
+
+        # Get top candidates (more than needed for balancing)
+        top_indices = self._top_indices(similarities, top_k * 3)
+        if clause_scores is not None:
+            top_indices = self._clause_candidates(clause_scores, top_indices, top_k)
+
         # Debug: Print top similarities
         print(f"\n🔍 Query: {query}")
         print(f"📊 Top 5 similarity scores:")
-        top_5_indices = np.argsort(similarities)[::-1][:5]
-        for idx in top_5_indices:
-            print(f"   {self.assessments[idx]['name']}: {similarities[idx]:.4f}")
-        
-        # Get top candidates (more than needed for balancing)
-        top_indices = np.argsort(similarities)[::-1][:min(len(self.assessments), top_k * 3)]
-        
-        # Extract query requirements
-        requirements = self._extract_requirements(query)
+        for idx in top_indices[:5]:
+            print(f"   {self.assessments.names[idx]}: {similarities[idx]:.4f}")
+
         print(f"🎯 Detected types: {requirements['test_types_needed']}")
-        
+
         # Balance recommendations by test type
-        recommendations = self._balance_recommendations(
+        ranking = self._balance_recommendations(
             top_indices, similarities, requirements, top_k
         )
-        
-        return recommendations
+
+        end = offset + top_k
+        if end > len(ranking):
+            # Extend with the best remaining assessments in score order
+            head = set(ranking)
+            candidates = self._top_indices(similarities, end + len(ranking))
+            ranking = ranking + [idx for idx in candidates.tolist() if idx not in head]
+
+        page = ranking[offset:end]
+        result = Ranking(
+            indices=page,
+            scores=[float(similarities[idx]) for idx in page],
+            total=len(similarities),
+            # BM25 pages while the encoder serves are a fallback, not the norm
+            degraded=engine == 'lexical' and self.engine == 'dense',
+            engine=engine,
+            matched_skills=self.skill_index.matched(page, skill_columns)
+        )
+        if query_embedding is not None and use_semantic:
+            self._semantic_cache.insert(query_embedding, (top_k, weights), (result, query))
+        return result
+
+    def recommend(self, query: str, top_k: int = 10, offset: int = 0,
+                  field_weights=None) -> List[Dict]:
+        """
+        Recommend assessments based on query
+        Returns balanced recommendations across test types
+        """
+        ranking = self.rank(query, top_k=top_k, offset=offset, field_weights=field_weights)
+        return [
+            dict(self._format_recommendation(idx, score), matched_skills=skills)
+            for idx, score, skills in zip(ranking.indices, ranking.scores, ranking.matched_skills)
+        ]
     
     def _extract_requirements(self, query: str) -> Dict:
         """Extract skill and test type requirements from query"""
         requirements = {
             'technical_skills': [],
             'behavioral_skills': [],
-            'test_types_needed': set()
+            'test_types_needed': set(),
+            # Columns of the skill index named in the query
+            'skill_columns': (self.skill_index.query_columns(query) if self.skill_index is not None
+                              else np.empty(0, dtype=np.int64))
         }
         
         query_lower = query.lower()
         
         # Technical skills (Knowledge & Skills - K)
-        tech_keywords = ['java', 'python', 'sql', 'javascript', 'programming', 
-                        'coding', 'technical', 'developer', 'engineer', 'software',
-                        'database', 'web', 'frontend', 'backend', 'fullstack',
-                        'react', 'node', 'angular', 'vue', 'django', 'flask',
-                        'c++', 'c#', 'ruby', 'php', 'go', 'rust', 'kotlin', 'swift']
-        for keyword in tech_keywords:
+        for keyword in TECH_KEYWORDS:
             if keyword in query_lower:
                 requirements['technical_skills'].append(keyword)
                 requirements['test_types_needed'].add('K')
         
         # Behavioral skills (Personality & Behavior - P)
-        behavioral_keywords = ['collaborate', 'collaboration', 'teamwork', 'team', 
-                              'communication', 'leadership', 'leader', 'personality', 
-                              'behavior', 'interpersonal', 'social', 'management',
-                              'manage', 'motivate', 'inspire', 'influence']
-        for keyword in behavioral_keywords:
+        for keyword in BEHAVIORAL_KEYWORDS:
             if keyword in query_lower:
                 requirements['behavioral_skills'].append(keyword)
                 requirements['test_types_needed'].add('P')
         
         # Cognitive/Ability (Ability & Aptitude - A)
-        cognitive_keywords = ['cognitive', 'analytical', 'problem-solving', 'reasoning',
-                             'logic', 'critical thinking', 'aptitude', 'ability',
-                             'numerical', 'verbal', 'abstract', 'spatial']
-        for keyword in cognitive_keywords:
+        for keyword in COGNITIVE_KEYWORDS:
             if keyword in query_lower:
                 requirements['test_types_needed'].add('A')
         
         # Competencies (C)
-        competency_keywords = ['competenc', 'skill', 'strategic', 'planning',
-                              'decision', 'judgment', 'professional']
-        for keyword in competency_keywords:
+        for keyword in COMPETENCY_KEYWORDS:
             if keyword in query_lower:
                 requirements['test_types_needed'].add('C')
         
@@ -178,8 +988,11 @@ class AssessmentRecommender:
     def _balance_recommendations(self, indices: np.ndarray, 
                                 similarities: np.ndarray,
                                 requirements: Dict, 
-                                top_k: int) -> List[Dict]:
-        """Balance recommendations across different test types"""
+                                top_k: int) -> List[int]:
+        """
+        Balance recommendations across different test types
+        Returns assessment indices sorted by relevance
+        """
         recommendations = []
         seen_indices = set()
         test_type_counts = defaultdict(int)
@@ -189,49 +1002,37 @@ class AssessmentRecommender:
         
         if len(needed_types) == 0:
             # No specific requirements, use top similarity scores
-            for idx in indices[:top_k]:
-                if idx not in seen_indices:
-                    recommendations.append(self._format_recommendation(idx, similarities[idx]))
-                    seen_indices.add(idx)
-            # Remove internal index
-            for rec in recommendations:
-                rec.pop('_idx', None)
-            return recommendations
+            return indices[:top_k].tolist()
         
         # Calculate slots per type
         slots_per_type = max(1, top_k // len(needed_types))
+        needed_codes = {self.assessments.type_code(t) for t in needed_types}
+        candidate_codes = self.assessments.test_type_codes[indices].tolist()
         
         # First pass: fill required types
-        for idx in indices:
+        for idx, test_type in zip(indices.tolist(), candidate_codes):
             if len(recommendations) >= top_k:
                 break
             
             if idx in seen_indices:
                 continue
-                
-            assessment = self.assessments[idx]
-            test_type = assessment.get('test_type', 'O')
             
-            if test_type in needed_types:
+            if test_type in needed_codes:
                 if test_type_counts[test_type] < slots_per_type:
-                    recommendations.append(self._format_recommendation(idx, similarities[idx]))
+                    recommendations.append(idx)
                     seen_indices.add(idx)
                     test_type_counts[test_type] += 1
         
         # Second pass: fill remaining slots with best matches
-        for idx in indices:
+        for idx in indices.tolist():
             if len(recommendations) >= top_k:
                 break
             if idx not in seen_indices:
-                recommendations.append(self._format_recommendation(idx, similarities[idx]))
+                recommendations.append(idx)
                 seen_indices.add(idx)
         
-        # Sort by relevance score BEFORE removing internal index
-        recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        # Remove internal index
-        for rec in recommendations:
-            rec.pop('_idx', None)
+        # Sort by relevance score
+        recommendations.sort(key=lambda idx: similarities[idx], reverse=True)
         
         print(f"✅ Returning {len(recommendations)} recommendations (sorted by relevance)\n")
         
@@ -240,21 +1041,16 @@ class AssessmentRecommender:
     def _format_recommendation(self, idx: int, score: float) -> Dict:
         """Format assessment as recommendation"""
         assessment = self.assessments[idx]
-        test_type = assessment.get('test_type', 'O')
-        # Convert single test_type to list if needed
-        if isinstance(test_type, str):
-            test_type = [test_type]
         
         return {
-            'assessment_name': assessment['name'],
-            'assessment_url': assessment['url'],
-            'description': assessment.get('description', ''),
-            'test_type': test_type,
-            'adaptive_support': assessment.get('adaptive_support', 'No'),
-            'remote_support': assessment.get('remote_support', 'Yes'),
-            'duration': assessment.get('duration'),
-            'relevance_score': float(score),
-            '_idx': idx  # Internal use for deduplication
+            'assessment_name': assessment.name,
+            'assessment_url': assessment.url,
+            'description': assessment.description,
+            'test_type': list(assessment.test_type),
+            'adaptive_support': assessment.adaptive_support,
+            'remote_support': assessment.remote_support,
+            'duration': assessment.duration,
+            'relevance_score': float(score)
         }
     
     def evaluate_recall(self, test_queries: List[Dict], k: int = 10) -> float:
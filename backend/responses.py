@@ -0,0 +1,55 @@
+"""
+Pre-serialized API payloads
+Each assessment's response object is encoded to JSON once at index time;
+/recommend responses are assembled by concatenating those fragments.
+"""
+import json
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+
+    def dumps(value) -> bytes:
+        return orjson.dumps(value)
+except ImportError:  # orjson is optional
+    def dumps(value) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_fragment(assessment: Dict) -> bytes:
+    """Encode one assessment exactly as the AssessmentRecommendation schema"""
+    test_type = assessment.get('test_type', 'O')
+    if isinstance(test_type, str):
+        test_type = [test_type]
+    duration = assessment.get('duration')
+
+    return dumps({
+        'url': assessment['url'],
+        'name': assessment['name'],
+        'adaptive_support': assessment.get('adaptive_support', 'No'),
+        'description': assessment.get('description', ''),
+        'duration': int(duration) if duration is not None else None,
+        'remote_support': assessment.get('remote_support', 'Yes'),
+        'test_type': list(test_type)
+    })
+
+
+def extend_fragment(fragment: bytes, fields: Dict) -> bytes:
+    """Append per-request fields to a pre-encoded assessment object"""
+    return b''.join((fragment[:-1], b',', dumps(fields)[1:]))
+
+
+def render_recommendations(fragments: List[bytes],
+                           next_cursor: Optional[str] = None,
+                           degraded: bool = False) -> bytes:
+    """Assemble a RecommendResponse body from pre-encoded fragments"""
+    return b''.join((
+        b'{"recommended_assessments":[',
+        b','.join(fragments),
+        b'],"next_cursor":',
+        dumps(next_cursor),
+        b',"degraded":',
+        b'true' if degraded else b'false',
+        b'}'
+    ))
+
@@ -0,0 +1,138 @@
+"""
+Assessment x skill overlap
+Catalog skills and the requirement keywords share one vocabulary, with
+aliases folded onto a canonical skill. A CSR matrix marks which assessment
+lists which skill, so overlap with a query's skills is one sparse mat-vec.
+"""
+import numpy as np
+from scipy import sparse
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from terms import tokenize
+
+# Spellings and near-synonyms mapped to the skill they count as
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'nodejs': 'node',
+    'node.js': 'node',
+    'reactjs': 'react',
+    'golang': 'go',
+    'py': 'python',
+    'postgres': 'sql',
+    'postgresql': 'sql',
+    'mysql': 'sql',
+    'databases': 'database',
+    'developers': 'developer',
+    'engineers': 'engineer',
+    'coding': 'programming',
+    'programmer': 'programming',
+    'team work': 'teamwork',
+    'collaborate': 'collaboration',
+    'collaborative': 'collaboration',
+    'communicate': 'communication',
+    'leader': 'leadership',
+    'manage': 'management',
+    'manager': 'management',
+    'problem solving': 'problem-solving',
+    'decision making': 'decision-making',
+    'logical reasoning': 'logical-reasoning',
+    'data analysis': 'data-analysis',
+    'behaviour': 'behavior',
+    'behavioral': 'behavior',
+    'behavioural': 'behavior',
+    'competencies': 'competency',
+}
+ALIAS_KEYS = {tuple(tokenize(a)): tuple(tokenize(b)) for a, b in SKILL_ALIASES.items()}
+
+
+class SkillIndex:
+    """Binary (assessments x skills) CSR matrix over a canonical skill vocabulary"""
+
+    def __init__(self, skills: Iterable[Sequence[str]], keywords: Iterable[str] = ()):
+        self.vocabulary: Dict[Tuple[str, ...], int] = {}
+        for keyword in keywords:
+            self._column(keyword)
+
+        rows, cols = [], []
+        num_docs = 0
+        for row, assessment_skills in enumerate(skills):
+            num_docs = row + 1
+            for skill in assessment_skills:
+                col = self._column(skill)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(num_docs, len(self.vocabulary))
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0  # two aliases of one skill still count once
+        self.matrix = matrix
+        self._finish()
+
+    @classmethod
+    def from_arrays(cls, vocabulary: List[str], data: np.ndarray, indices: np.ndarray,
+                    indptr: np.ndarray, num_docs: int) -> 'SkillIndex':
+        """Rebuild an index from skills() and its CSR arrays"""
+        index = cls.__new__(cls)
+        index.vocabulary = {tuple(skill.split(' ')): i for i, skill in enumerate(vocabulary)}
+        index.matrix = sparse.csr_matrix(
+            (data, indices, indptr), shape=(num_docs, len(vocabulary)), copy=False
+        )
+        index._finish()
+        return index
+
+    def _finish(self):
+        self._names = np.array(self.skills(), dtype=object)
+        self.max_length = max((len(k) for k in list(self.vocabulary) + list(ALIAS_KEYS)), default=0)
+
+    @staticmethod
+    def _key(tokens: Sequence[str]) -> Tuple[str, ...]:
+        tokens = tuple(tokens)
+        return ALIAS_KEYS.get(tokens, tokens)
+
+    def _column(self, skill: str):
+        tokens = tokenize(skill)
+        if not tokens:
+            return None
+        return self.vocabulary.setdefault(self._key(tokens), len(self.vocabulary))
+
+    def skills(self) -> List[str]:
+        """Canonical skills in column order"""
+        return [' '.join(key) for key in self.vocabulary]
+
+    def query_columns(self, text: str) -> np.ndarray:
+        """Sorted columns of the skills named in text, longest match first"""
+        tokens = tokenize(text)
+        columns = []
+        position = 0
+        while position < len(tokens):
+            for length in range(min(self.max_length, len(tokens) - position), 0, -1):
+                col = self.vocabulary.get(self._key(tokens[position:position + length]))
+                if col is not None:
+                    columns.append(col)
+                    position += length
+                    break
+            else:
+                position += 1
+        return np.unique(np.asarray(columns, dtype=np.int64))
+
+    def overlap(self, columns: np.ndarray) -> np.ndarray:
+        """Share of the query skills each assessment lists, in [0, 1]"""
+        if len(columns) == 0:
+            return np.zeros(self.matrix.shape[0], dtype=np.float32)
+        query = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        query[columns] = 1.0 / len(columns)
+        return self.matrix @ query
+
+    def matched(self, rows: Sequence[int], columns: np.ndarray) -> List[List[str]]:
+        """For each row, the query skills that assessment lists"""
+        if len(columns) == 0 or len(rows) == 0:
+            return [[] for _ in rows]
+        hits = self.matrix[np.asarray(rows)][:, columns].tocoo()
+        order = np.lexsort((hits.col, hits.row))
+        names = self._names[columns[hits.col[order]]]
+        counts = np.bincount(hits.row, minlength=len(rows))
+        return [group.tolist() for group in np.split(names, np.cumsum(counts)[:-1])]
@@ -0,0 +1,144 @@
+"""
+Single-file snapshot of a built recommender index
+Layout: an 8-byte magic, the length of a JSON header, the header, then raw
+arrays each starting on a 64-byte boundary. Restoring memory-maps the file
+and wraps every array as a numpy view, so nothing is parsed or unpickled
+beyond the header; strings are decoded only for the rows that are read.
+"""
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+
+from catalog import Catalog
+
+MAGIC = b'APTSNAP1'
+ALIGNMENT = 64
+SKILL_SEPARATOR = '\x1f'
+
+
+class StringColumn:
+    """Sequence over concatenated UTF-8 (or raw bytes) values and their offsets"""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray, decode: bool = True, convert=None):
+        self._offsets = offsets
+        self._blob = blob
+        self._decode = decode
+        self._convert = convert
+
+    def __getitem__(self, idx: int):
+        idx = int(idx)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        value = self._blob[self._offsets[idx]:self._offsets[idx + 1]].tobytes()
+        if self._decode:
+            value = value.decode('utf-8')
+        return self._convert(value) if self._convert else value
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+def pack_strings(values: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets and blob arrays for a column of str or bytes values"""
+    encoded = [v if isinstance(v, bytes) else v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray], meta: Dict):
+    """Write arrays and metadata; the file is replaced atomically"""
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({'meta': meta, 'arrays': layout}).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name][2])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """Memory-map a snapshot; arrays are read-only views over the mapping"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a recommender snapshot")
+        header_len, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_len))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    data_start = -(-(len(MAGIC) + 8 + header_len) // ALIGNMENT) * ALIGNMENT
+    arrays = {}
+    for name, (dtype, shape, offset) in header['arrays'].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape)) if shape else 1
+        if count == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + offset
+        ).reshape(shape)
+    return arrays, header['meta']
+
+
+def catalog_arrays(catalog: Catalog) -> Dict[str, np.ndarray]:
+    arrays = {
+        'test_type_codes': catalog.test_type_codes,
+        'durations': catalog.durations,
+        'adaptive': catalog.adaptive.view(np.uint8),
+        'remote': catalog.remote.view(np.uint8),
+    }
+    columns = {
+        'names': catalog.names,
+        'urls': catalog.urls,
+        'descriptions': catalog.descriptions,
+        'skills': [SKILL_SEPARATOR.join(s) for s in catalog.skills],
+        'test_types': [SKILL_SEPARATOR.join(t) for t in catalog.test_types],
+    }
+    for name, values in columns.items():
+        arrays[f'{name}_offsets'], arrays[f'{name}_blob'] = pack_strings(values)
+    return arrays
+
+
+def _split_skills(value: str) -> tuple:
+    return tuple(value.split(SKILL_SEPARATOR)) if value else ()
+
+
+def catalog_from_arrays(arrays: Dict[str, np.ndarray], type_table: List[str]) -> Catalog:
+    catalog = Catalog()
+    catalog.type_table = list(type_table)
+    catalog._type_codes = {t: i for i, t in enumerate(catalog.type_table)}
+    catalog.names = StringColumn(arrays['names_offsets'], arrays['names_blob'])
+    catalog.urls = StringColumn(arrays['urls_offsets'], arrays['urls_blob'])
+    catalog.descriptions = StringColumn(arrays['descriptions_offsets'], arrays['descriptions_blob'])
+    catalog.skills = StringColumn(arrays['skills_offsets'], arrays['skills_blob'], convert=_split_skills)
+    catalog.test_type_codes = arrays['test_type_codes']
+    if 'test_types_offsets' in arrays:
+        catalog.test_types = StringColumn(
+            arrays['test_types_offsets'], arrays['test_types_blob'], convert=_split_skills
+        )
+    else:
+        catalog.test_types = [(catalog.type_table[code],) for code in catalog.test_type_codes]
+    catalog.durations = arrays['durations']
+    catalog.adaptive = arrays['adaptive'].view(bool)
+    catalog.remote = arrays['remote'].view(bool)
+    return catalog
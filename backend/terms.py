@@ -0,0 +1,81 @@
+"""
+Term-composition fast path for keyword-only queries
+Catalog vocabulary (skills, requirement keywords, assessment names) is
+embedded once at index time. A query made up entirely of known terms is
+encoded as the mean of their cached vectors instead of a model forward pass.
+"""
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:[-.][a-z0-9+#]+)*")
+
+# Connectors that may appear between terms without breaking coverage
+FILLER_WORDS = {'and', 'or', 'with', 'plus', 'the', 'a', 'an', 'of', 'for', 'in', '&'}
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_PATTERN.findall(text.lower()))
+
+
+class TermTable:
+    """Embeddings for catalog terms, matched greedily by longest term first"""
+
+    def __init__(self, terms: Iterable[str], encoder, max_query_tokens: int = 6):
+        keys = {}
+        for term in terms:
+            tokens = tuple(t for t in tokenize(term) if t not in FILLER_WORDS)
+            if tokens and tokens not in keys:
+                keys[tokens] = ' '.join(tokens)
+
+        self.max_query_tokens = max_query_tokens
+        self.max_term_length = max((len(k) for k in keys), default=0)
+        self._rows: Dict[Tuple[str, ...], int] = {k: i for i, k in enumerate(keys)}
+
+        vectors = encoder.encode(list(keys.values())) if keys else np.empty((0, 0))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True) if len(keys) else 1.0
+        self.vectors = (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+    @classmethod
+    def from_arrays(cls, terms: List[str], vectors: np.ndarray, max_query_tokens: int) -> 'TermTable':
+        """Rebuild a table from terms() and vectors without re-encoding"""
+        table = cls.__new__(cls)
+        table._rows = {tuple(term.split(' ')): i for i, term in enumerate(terms)}
+        table.max_term_length = max((len(k) for k in table._rows), default=0)
+        table.max_query_tokens = max_query_tokens
+        table.vectors = vectors
+        return table
+
+    def terms(self) -> List[str]:
+        """Normalized terms in row order"""
+        return [' '.join(tokens) for tokens in self._rows]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def match(self, query: str) -> Optional[List[int]]:
+        """Rows of the terms covering every query token, or None"""
+        tokens = [t for t in tokenize(query) if t not in FILLER_WORDS]
+        if not tokens or len(tokens) > self.max_query_tokens:
+            return None
+
+        rows = []
+        position = 0
+        while position < len(tokens):
+            for length in range(min(self.max_term_length, len(tokens) - position), 0, -1):
+                row = self._rows.get(tuple(tokens[position:position + length]))
+                if row is not None:
+                    rows.append(row)
+                    position += length
+                    break
+            else:
+                return None
+        return rows
+
+    def compose(self, query: str) -> Optional[np.ndarray]:
+        """Query vector composed from cached term vectors, or None if not covered"""
+        rows = self.match(query)
+        if rows is None:
+            return None
+        return self.vectors[rows].mean(axis=0)
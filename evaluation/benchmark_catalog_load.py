@@ -0,0 +1,76 @@
+"""
+Catalog load time and RSS: assessments.json vs memory-mapped Arrow
+Each load runs in a fresh subprocess so RSS reflects only that load.
+
+Usage: python benchmark_catalog_load.py [rows ...]
+"""
+import json
+import subprocess
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from catalog import Catalog, write_arrow
+from responses import build_fragment
+from benchmark_catalog_memory import synthetic_json
+
+
+LOADER = '''
+import sys, time, json
+sys.path.insert(0, {backend!r})
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 1024 / 1024
+import numpy as np
+from catalog import Catalog, load_arrow
+base = rss_mb()
+start = time.perf_counter()
+if {path!r}.endswith('.json'):
+    with open({path!r}, 'r', encoding='utf-8') as f:
+        catalog = Catalog.from_records(json.load(f))
+else:
+    catalog, embeddings, fragments, _, _ = load_arrow({path!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'rss_mb': rss_mb() - base}}))
+'''
+
+
+def run_loader(path: str) -> dict:
+    backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+    output = subprocess.check_output(
+        [sys.executable, '-c', LOADER.format(backend=backend, path=path)]
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            text = synthetic_json(rows)
+            json_path = os.path.join(tmp, f'catalog_{rows}.json')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+            records = json.loads(text)
+            del text
+            catalog = Catalog.from_records(records)
+            fragments = [build_fragment(r) for r in records]
+            del records
+            embeddings = np.random.default_rng(0).standard_normal((rows, 384), dtype=np.float32)
+            arrow_path = os.path.join(tmp, f'catalog_{rows}.arrow')
+            write_arrow(arrow_path, catalog, embeddings, fragments, 'synthetic')
+            del catalog, fragments, embeddings
+
+            from_json = run_loader(json_path)
+            from_arrow = run_loader(arrow_path)
+            print(f"{rows:>9,} rows | json (no embeddings) {from_json['seconds'] * 1000:8.1f} ms "
+                  f"{from_json['rss_mb']:8.1f} MB | arrow (with embeddings) "
+                  f"{from_arrow['seconds'] * 1000:6.1f} ms {from_arrow['rss_mb']:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
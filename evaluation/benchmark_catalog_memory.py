@@ -0,0 +1,66 @@
+"""
+Memory comparison: list of assessment dicts vs columnar Catalog
+Generates synthetic catalogs shaped like assessments.json and measures the
+memory retained by each representation with tracemalloc.
+"""
+import gc
+import json
+import random
+import sys
+import os
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from catalog import Catalog
+
+
+SKILLS = ['java', 'python', 'sql', 'javascript', 'programming', 'technical',
+          'teamwork', 'collaboration', 'communication', 'leadership',
+          'cognitive', 'reasoning', 'numerical', 'verbal', 'management']
+TYPES = ['K', 'P', 'A', 'C', 'B', 'S']
+
+
+def synthetic_json(rows: int, seed: int = 0) -> str:
+    """JSON text for a synthetic catalog, so parsing allocates like json.load"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        skills = rng.sample(SKILLS, 4)
+        records.append({
+            'name': f"{skills[0].title()} Assessment {i}",
+            'url': f"https://www.shl.com/solutions/products/product-catalog/view/assessment-{i}/",
+            'description': f"Measures {skills[0]} and {skills[1]} for role family {i % 500}.",
+            'test_type': rng.choice(TYPES),
+            'adaptive_support': rng.choice(['Yes', 'No']),
+            'remote_support': 'Yes',
+            'duration': rng.choice([None, 15, 20, 30, 45, 60]),
+            'skills': skills
+        })
+    return json.dumps(records)
+
+
+def retained_mb(build) -> float:
+    """MB still allocated after build() returns, keeping its result alive"""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del result
+    return used / 1024 / 1024
+
+
+def measure(rows: int):
+    text = synthetic_json(rows)
+    dicts_mb = retained_mb(lambda: json.loads(text))
+    catalog_mb = retained_mb(lambda: Catalog.from_records(json.loads(text)))
+    print(f"{rows:>9,} rows | dicts {dicts_mb:8.1f} MB | catalog {catalog_mb:8.1f} MB"
+          f" | {dicts_mb / catalog_mb:.2f}x smaller")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for rows in sizes:
+        measure(rows)
@@ -0,0 +1,64 @@
+"""
+Benchmark encoder backends: torch vs ONNX Runtime (fp32 and int8)
+Reports cosine agreement with the torch backend and single-query / batched
+latency. Export the ONNX models first with scripts/export_onnx.py --quantize.
+
+Usage: python benchmark_encoders.py [onnx_model_dir]
+"""
+import json
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from encoders import OnnxEncoder, SentenceTransformerEncoder
+
+
+def cosine_agreement(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity between two embedding matrices"""
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def latency_ms(encoder, texts, batch_size: int, repeat: int = 20) -> float:
+    """Mean milliseconds per encode() call"""
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    for i in range(repeat):
+        offset = (i * batch_size) % max(1, len(texts) - batch_size)
+        encoder.encode(texts[offset:offset + batch_size], batch_size=batch_size)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def load_texts():
+    with open('../data/assessments.json', 'r', encoding='utf-8') as f:
+        assessments = json.load(f)
+    texts = [f"{a['name']} {a['description']} {' '.join(a.get('skills', []))}" for a in assessments]
+    for path in ('../data/train_labeled.csv', '../data/test_unlabeled.csv'):
+        texts.extend(pd.read_csv(path)['query'].unique().tolist())
+    return texts
+
+
+if __name__ == "__main__":
+    model_dir = sys.argv[1] if len(sys.argv) > 1 else '../backend/models/onnx'
+    texts = load_texts()
+
+    torch_encoder = SentenceTransformerEncoder(
+        json.load(open(os.path.join(model_dir, 'encoder_config.json')))['model_name']
+    )
+    backends = {'torch': torch_encoder, 'onnx': OnnxEncoder(model_dir)}
+    if os.path.exists(os.path.join(model_dir, 'model_quantized.onnx')):
+        backends['onnx-int8'] = OnnxEncoder(model_dir, quantized=True)
+
+    reference = torch_encoder.encode(texts)
+    print(f"{'backend':<10} {'min cos':>8} {'mean cos':>9} {'1 query':>10} {'batch 32':>10}")
+    for name, encoder in backends.items():
+        agreement = cosine_agreement(reference, encoder.encode(texts))
+        single = latency_ms(encoder, texts, batch_size=1)
+        batched = latency_ms(encoder, texts * 4, batch_size=32)
+        print(f"{name:<10} {agreement.min():8.4f} {agreement.mean():9.4f} "
+              f"{single:8.2f}ms {batched:8.2f}ms")
@@ -0,0 +1,54 @@
+"""
+Catalog encoding throughput vs number of worker processes
+Encodes synthetic catalogs with encode_parallel for each worker count and
+reports texts/second and speedup over one worker. Wall time includes
+starting the pool and loading one model replica per worker. Texts are
+sorted by token length, as in the service; tokenizing is timed separately.
+
+Usage: python benchmark_index_build.py [--rows 100000 1000000] [--workers 1 2 4 8]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from catalog import Catalog
+from encoders import encode_parallel, load_encoder
+from benchmark_catalog_memory import synthetic_json
+
+
+def default_workers():
+    cores = os.cpu_count() or 1
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers())
+    parser.add_argument('--model', default=os.getenv('EMBEDDING_MODEL', 'paraphrase-MiniLM-L3-v2'))
+    parser.add_argument('--batch-size', type=int, default=int(os.getenv('INDEX_BATCH_SIZE', 32)))
+    args = parser.parse_args()
+
+    encoder = load_encoder(args.model)
+    for rows in args.rows:
+        catalog = Catalog.from_records(json.loads(synthetic_json(rows)))
+        texts = [catalog.index_text(i) for i in range(rows)]
+        del catalog
+        start = time.perf_counter()
+        lengths = encoder.token_lengths(texts)
+        print(f"\n{rows:,} texts, token lengths in {time.perf_counter() - start:.1f}s")
+        print(f"{'workers':>8} {'seconds':>9} {'texts/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            encode_parallel(args.model, texts, workers, args.batch_size, lengths=lengths)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:8d} {elapsed:9.1f} {rows / elapsed:10.0f} {baseline / elapsed:7.2f}x")
@@ -0,0 +1,76 @@
+"""
+Benchmark /recommend response serialization
+Compares building pydantic models per request (validated and encoded again
+by FastAPI) against concatenating fragments pre-encoded at index time.
+"""
+import json
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from fastapi.encoders import jsonable_encoder
+from app import AssessmentRecommendation, RecommendResponse
+from responses import build_fragment, extend_fragment, render_recommendations
+
+
+def pydantic_path(assessments, indices):
+    """Per-request model construction as FastAPI does with response_model"""
+    formatted = []
+    for idx in indices:
+        a = assessments[idx]
+        test_type = a.get('test_type', 'O')
+        if isinstance(test_type, str):
+            test_type = [test_type]
+        formatted.append(AssessmentRecommendation(
+            url=a['url'],
+            name=a['name'],
+            adaptive_support=a.get('adaptive_support', 'No'),
+            description=a.get('description', ''),
+            duration=a.get('duration'),
+            remote_support=a.get('remote_support', 'Yes'),
+            test_type=test_type,
+            matched_skills=[]
+        ))
+    response = RecommendResponse(recommended_assessments=formatted, next_cursor=None)
+    # FastAPI re-validates against response_model before encoding
+    validated = RecommendResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode('utf-8')
+
+
+def fragment_path(fragments, indices):
+    """Pre-encoded fragments extended per request with matched_skills, as compute_page does"""
+    return render_recommendations(
+        [extend_fragment(fragments[idx], {"matched_skills": []}) for idx in indices], None
+    )
+
+
+def bench(fn, *args, repeat: int = 2000) -> float:
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    with open('../data/assessments.json', 'r', encoding='utf-8') as f:
+        assessments = json.load(f)
+
+    start = time.perf_counter()
+    fragments = [build_fragment(a) for a in assessments]
+    build_ms = (time.perf_counter() - start) * 1000
+
+    indices = [i % len(assessments) for i in range(10)]
+
+    # Both paths must produce the same document
+    assert json.loads(pydantic_path(assessments, indices)) == \
+        json.loads(fragment_path(fragments, indices))
+
+    before = bench(pydantic_path, assessments, indices)
+    after = bench(fragment_path, fragments, indices)
+
+    print(f"Fragment precompute: {build_ms:.2f} ms for {len(assessments)} assessments")
+    print(f"pydantic + jsonable_encoder: {before:8.1f} µs / response")
+    print(f"pre-encoded fragments:       {after:8.1f} µs / response")
+    print(f"Speedup: {before / after:.1f}x")
@@ -0,0 +1,73 @@
+"""
+Cold start: rebuilding the recommender from JSON vs restoring a snapshot
+Each start runs in a fresh subprocess and times AssessmentRecommender()
+plus the first recommend() call, with the same encoder in both runs, so the
+difference is the parse + encode + index build that the snapshot skips.
+
+Usage: python benchmark_snapshot.py [rows ...]   (0 = data/assessments.json)
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmark_catalog_memory import synthetic_json
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+STARTER = '''
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {backend!r})
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 1024 / 1024
+from recommender import AssessmentRecommender
+recommender = AssessmentRecommender({path!r})
+ready = time.perf_counter() - start
+recommender.recommend('Java developer who collaborates with business teams', top_k=10)
+print(json.dumps({{'ready': ready, 'first': time.perf_counter() - start, 'rss_mb': rss_mb()}}))
+'''
+
+
+def start(path: str, snapshot: str = None) -> dict:
+    env = dict(os.environ, PROGRESSIVE_STARTUP='0')
+    env.pop('SNAPSHOT_PATH', None)
+    if snapshot:
+        env['SNAPSHOT_PATH'] = snapshot
+    output = subprocess.check_output(
+        [sys.executable, '-c', STARTER.format(backend=BACKEND, path=path)], env=env
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [0, 10_000]
+    build = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'build_snapshot.py')
+    print(f"{'rows':>9} | {'rebuild ready':>13} {'first rec':>10} {'RSS':>8} | "
+          f"{'snapshot ready':>14} {'first rec':>10} {'RSS':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            if rows:
+                json_path = os.path.join(tmp, f'catalog_{rows}.json')
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    f.write(synthetic_json(rows))
+            else:
+                json_path = os.path.abspath('../data/assessments.json')
+            snapshot = os.path.join(tmp, f'catalog_{rows}.snapshot')
+            subprocess.check_call(
+                [sys.executable, build, '--catalog', json_path, '--output', snapshot],
+                stdout=subprocess.DEVNULL
+            )
+
+            rebuilt = start(json_path)
+            restored = start(json_path, snapshot)
+            label = f"{rows:,}" if rows else 'catalog'
+            print(f"{label:>9} | {rebuilt['ready']:12.3f}s {rebuilt['first']:9.3f}s "
+                  f"{rebuilt['rss_mb']:6.0f}MB | {restored['ready']:13.3f}s "
+                  f"{restored['first']:9.3f}s {restored['rss_mb']:6.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
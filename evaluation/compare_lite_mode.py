@@ -0,0 +1,68 @@
+"""
+Compare RECOMMENDER_MODE=lite (BM25) with the transformer (dense) mode
+Each mode runs in a fresh subprocess, so startup time and peak RSS include
+the imports. Reports recall@10 on the labeled queries, whether torch was
+imported, startup time and peak RSS. The bundled catalog holds about as
+many assessments as k, so --distractors adds synthetic ones that recall@10
+has to rank past.
+
+Usage: python compare_lite_mode.py [modes ...] [--distractors 1000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmark_catalog_memory import synthetic_json
+
+CHILD = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, '../backend')
+from recommender import AssessmentRecommender
+recommender = AssessmentRecommender(CATALOG_PATH)
+startup = time.perf_counter() - start
+from evaluate import evaluate_recommender, load_labeled_data
+recall = evaluate_recommender(recommender, load_labeled_data('../data/train_labeled.csv'), k=10)
+print(json.dumps({
+    'recall': float(recall['mean_recall@10']),
+    'startup_s': startup,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'torch': 'torch' in sys.modules,
+}))
+'''
+
+
+def run(mode: str, path: str) -> dict:
+    env = dict(os.environ, RECOMMENDER_MODE=mode)
+    output = subprocess.check_output([sys.executable, '-c', CHILD.replace('CATALOG_PATH', repr(path))], env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def padded_catalog(directory: str, distractors: int) -> str:
+    """The bundled catalog followed by `distractors` synthetic assessments"""
+    with open('../data/assessments.json', 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    records += json.loads(synthetic_json(distractors))
+    path = os.path.join(directory, 'assessments.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modes', nargs='*', default=['dense', 'lite'])
+    parser.add_argument('--distractors', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = padded_catalog(tmp, args.distractors)
+        print(f"catalog: bundled assessments + {args.distractors:,} synthetic distractors")
+        print(f"{'mode':<6} {'recall@10':>10} {'startup':>9} {'peak RSS':>10} {'torch':>6}")
+        for mode in args.modes:
+            result = run(mode, path)
+            print(f"{mode:<6} {result['recall']:10.4f} {result['startup_s']:8.2f}s "
+                  f"{result['rss_mb']:8.0f}MB {str(result['torch']):>6}")
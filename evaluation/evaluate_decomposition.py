@@ -0,0 +1,57 @@
+"""
+Requirement decomposition (QUERY_DECOMPOSITION=1) vs one query embedding
+Reports recall@10 on the labeled queries. For every multi-requirement
+query in the labeled and unlabeled sets it also reports clause coverage:
+the share of clauses whose own best match is among the returned top_k.
+
+Usage: python evaluate_decomposition.py [top_k]   (default 5)
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from cache import canonical_query
+from evaluate import evaluate_recommender, load_labeled_data
+from recommender import AssessmentRecommender
+
+EXTRA_QUERIES = [
+    "Java developer who collaborates with business teams, plus a cognitive test",
+    "Sales manager with strong leadership; numerical reasoning as well as personality",
+    "Python and SQL analyst who communicates clearly, along with an aptitude test",
+]
+
+
+def coverage(recommender, queries, decompose: bool, top_k: int):
+    recommender.decompose = decompose
+    recommender._score_cache.clear()
+    covered, clauses_seen, elapsed = 0, 0, 0.0
+    for query in queries:
+        clauses = recommender._requirement_clauses(canonical_query(query))
+        if not clauses:
+            continue
+        start = time.perf_counter()
+        returned = set(recommender.rank(query, top_k=top_k).indices)
+        elapsed += time.perf_counter() - start
+        clause_scores = recommender._similarity(recommender._encode_clauses(clauses)).T
+        covered += sum(int(row.argmax()) in returned for row in clause_scores)
+        clauses_seen += len(clauses)
+    return covered / max(clauses_seen, 1), clauses_seen, elapsed * 1000
+
+
+if __name__ == "__main__":
+    top_k = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    labeled = load_labeled_data('../data/train_labeled.csv')
+    unlabeled = pd.read_csv('../data/test_unlabeled.csv')['query'].tolist()
+    queries = [item['query'] for item in labeled] + unlabeled + EXTRA_QUERIES
+    recommender = AssessmentRecommender('../data/assessments.json')
+
+    print(f"\n{'mode':<16} {'recall@10':>10} {f'coverage@{top_k}':>16} {'clauses':>8} {'total ms':>9}")
+    for label, decompose in [('single vector', False), ('decomposed', True)]:
+        recommender.decompose = decompose
+        recommender._score_cache.clear()
+        recall = evaluate_recommender(recommender, labeled, k=10)['mean_recall@10']
+        covered, clauses, ms = coverage(recommender, queries, decompose, top_k)
+        print(f"{label:<16} {recall:10.4f} {covered:16.2%} {clauses:8d} {ms:9.1f}")
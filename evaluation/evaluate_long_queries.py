@@ -0,0 +1,89 @@
+"""
+Long job descriptions: whole-query encoding vs sentence-window chunking
+Each labeled query is buried in a pasted-JD template (company intro before
+it, benefits and boilerplate after it), past the point where the encoder
+truncates its input. Reports recall@10 without chunking and with max / mean
+pooled windows, then query latency as the description grows.
+
+Usage: python evaluate_long_queries.py [--intro-sentences 12] [--lengths 100 200 400 800 1600]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from evaluate import evaluate_recommender, load_labeled_data
+from recommender import AssessmentRecommender
+
+INTRO = [
+    "Founded over twenty years ago, our company serves customers in more than forty countries.",
+    "We are proud of a culture built on curiosity, ownership and continuous improvement.",
+    "Our offices are located in vibrant city centres with easy access to public transport.",
+    "The team you will join works closely with stakeholders across several regions.",
+]
+OUTRO = [
+    "We offer a competitive salary, an annual bonus and a generous pension scheme.",
+    "Benefits include private health insurance, flexible hours and hybrid working.",
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Please apply with your CV and a short cover letter before the closing date.",
+]
+
+
+def long_description(query: str, intro_sentences: int, outro_sentences: int = 8) -> str:
+    intro = [INTRO[i % len(INTRO)] for i in range(intro_sentences)]
+    outro = [OUTRO[i % len(OUTRO)] for i in range(outro_sentences)]
+    return ' '.join(intro + [query.rstrip('.') + '.'] + outro)
+
+
+def configure(recommender, chunk_words: int, pooling: str = 'max'):
+    recommender.chunk_words = chunk_words
+    recommender.chunk_pooling = pooling
+    recommender._embedding_cache.clear()
+    recommender._score_cache.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--intro-sentences', type=int, default=12)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[100, 200, 400, 800, 1600])
+    args = parser.parse_args()
+
+    labeled = load_labeled_data('../data/train_labeled.csv')
+    recommender = AssessmentRecommender('../data/assessments.json')
+    chunk_words = recommender.chunk_words or 64
+    long_queries = [
+        dict(item, query=long_description(item['query'], args.intro_sentences)) for item in labeled
+    ]
+    words = sum(len(item['query'].split()) for item in long_queries) / len(long_queries)
+
+    modes = [('whole query', 0, 'max'), ('windows, max', chunk_words, 'max'),
+             ('windows, mean', chunk_words, 'mean')]
+    recalls = {}
+    for label, words_per_window, pooling in modes:
+        configure(recommender, words_per_window, pooling)
+        short = evaluate_recommender(recommender, labeled, k=10)['mean_recall@10']
+        configure(recommender, words_per_window, pooling)
+        recalls[label] = (short, evaluate_recommender(recommender, long_queries, k=10)['mean_recall@10'])
+
+    # Latency per query as the description grows, every encode uncached
+    latencies = []
+    for length in args.lengths:
+        sentences = max(length // 14 - 8, 0)
+        query = long_description(labeled[0]['query'], sentences)
+        row = [len(query.split())]
+        for _, words_per_window, pooling in modes[:2]:
+            configure(recommender, words_per_window, pooling)
+            start = time.perf_counter()
+            recommender.rank(query, top_k=10)
+            row.append((time.perf_counter() - start) * 1000)
+        latencies.append(row)
+
+    print(f"\nRecall@10 (long descriptions average {words:.0f} words, windows of {chunk_words})")
+    print(f"{'mode':<14} {'short queries':>14} {'long JDs':>9}")
+    for label, (short, long) in recalls.items():
+        print(f"{label:<14} {short:14.4f} {long:9.4f}")
+
+    print(f"\n{'words':>6} {'whole ms':>9} {'windows ms':>11}")
+    for length, whole, windowed in latencies:
+        print(f"{length:>6} {whole:9.1f} {windowed:11.1f}")
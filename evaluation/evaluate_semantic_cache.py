@@ -0,0 +1,72 @@
+"""
+Sweep the semantic cache distance threshold over paraphrased queries
+Each labeled query is ranked fresh, then rephrased variants are ranked
+through the semantic cache. Reports the cache hit rate on the variants, how
+far served rankings diverge from fresh ones (1 - overlap@10) and the recall
+change against the labels.
+
+Usage: python evaluate_semantic_cache.py [threshold ...]
+"""
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from cache import SemanticCache
+from evaluate import calculate_recall_at_k, load_labeled_data
+from recommender import AssessmentRecommender
+
+THRESHOLDS = [0.02, 0.05, 0.1, 0.15, 0.2]
+
+REPHRASINGS = [
+    ("I am hiring for", "We are hiring for"),
+    ("I am looking for", "We are looking for"),
+    ("Looking to hire", "We want to hire"),
+    ("Need", "We need"),
+]
+PREFIXES = ["Please recommend: ", "Suggest assessments for: "]
+
+
+def variants(query: str):
+    """Filler-word rewrites of a query that should keep its meaning"""
+    rewritten = [query.replace(a, b, 1) for a, b in REPHRASINGS if a in query]
+    return rewritten + [prefix + query for prefix in PREFIXES] + [query.rstrip('.') + '?']
+
+
+def urls(recommender, ranking):
+    return [recommender.assessments[idx].url for idx in ranking.indices]
+
+
+if __name__ == "__main__":
+    thresholds = [float(t) for t in sys.argv[1:]] or THRESHOLDS
+    queries = load_labeled_data('../data/train_labeled.csv')
+    recommender = AssessmentRecommender('../data/assessments.json')
+
+    # Fresh rankings for every variant, with the semantic cache off
+    recommender._semantic_cache = None
+    fresh = {}
+    for item in queries:
+        for text in [item['query']] + variants(item['query']):
+            fresh[text] = urls(recommender, recommender.rank(text, top_k=10))
+
+    print(f"\n{'distance':>8} {'hit rate':>9} {'divergence':>11} {'recall Δ':>9}")
+    for threshold in thresholds:
+        cache = SemanticCache(capacity=len(fresh), max_distance=threshold)
+        recommender._semantic_cache = cache
+        recommender._score_cache.clear()
+        hits, divergence, recall_delta = [], [], []
+        for item in queries:
+            recommender.rank(item['query'], top_k=10)
+            for text in variants(item['query']):
+                stored = len(cache)
+                served = urls(recommender, recommender.rank(text, top_k=10))
+                # A miss inserts the fresh ranking, a hit leaves the cache as is
+                hits.append(len(cache) == stored)
+                divergence.append(1 - len(set(served) & set(fresh[text])) / 10)
+                recall_delta.append(
+                    calculate_recall_at_k(served, item['relevant_urls'])
+                    - calculate_recall_at_k(fresh[text], item['relevant_urls'])
+                )
+        print(f"{threshold:8.2f} {np.mean(hits):9.1%} {np.mean(divergence):11.4f} "
+              f"{np.mean(recall_delta):+9.4f}")
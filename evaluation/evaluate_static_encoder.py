@@ -0,0 +1,41 @@
+"""
+Recall@10 of the static token encoder against the full model
+The catalog stays encoded with the full model; only query encoding changes.
+
+Usage: python evaluate_static_encoder.py [static_model_dir]
+"""
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from encoders import StaticEncoder
+from evaluate import evaluate_recommender, load_labeled_data
+from recommender import AssessmentRecommender
+
+
+def encode_latency_us(encoder, queries, repeat: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            encoder.encode([query])
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+if __name__ == "__main__":
+    static_dir = sys.argv[1] if len(sys.argv) > 1 else '../backend/models/static'
+    queries = load_labeled_data('../data/train_labeled.csv')
+    texts = [q['query'] for q in queries]
+
+    recommender = AssessmentRecommender('../data/assessments.json')
+    full = evaluate_recommender(recommender, queries, k=10)
+    full_us = encode_latency_us(recommender.query_encoder, texts, repeat=5)
+
+    recommender.query_encoder = StaticEncoder(static_dir)
+    recommender._score_cache.clear()
+    static = evaluate_recommender(recommender, queries, k=10)
+    static_us = encode_latency_us(recommender.query_encoder, texts)
+
+    print(f"\n{'encoder':<8} {'recall@10':>10} {'encode':>12}")
+    print(f"{'full':<8} {full['mean_recall@10']:10.4f} {full_us:10.1f}µs")
+    print(f"{'static':<8} {static['mean_recall@10']:10.4f} {static_us:10.1f}µs")
@@ -0,0 +1,76 @@
+"""
+Sweep the Matryoshka prefix size (PREFIX_DIMS) used for first-pass scoring
+For each prefix size reports recall@10 on the labeled queries, both from the
+prefix alone and after rescoring the shortlist with full vectors, and the
+per-query scoring latency on a synthetic matrix of --rows embeddings (the
+labeled catalog is far too small to time a matmul on).
+
+Usage: python sweep_prefix_dims.py [--dims 32 64 128 192] [--rescore 200] [--rows 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from evaluate import evaluate_recommender, load_labeled_data
+from recommender import AssessmentRecommender
+
+
+def configure(recommender, dims: int, rescore: int):
+    recommender.prefix_dims = dims
+    recommender.prefix_rescore = rescore
+    recommender._build_prefix_index()
+    recommender._score_cache.clear()
+
+
+def recall(recommender, queries, dims: int, rescore: int) -> float:
+    configure(recommender, dims, rescore)
+    return float(evaluate_recommender(recommender, queries, k=10)['mean_recall@10'])
+
+
+def latency_ms(recommender, queries: np.ndarray, dims: int, rescore: int) -> float:
+    configure(recommender, dims, rescore)
+    recommender._score(queries[0])  # warm-up
+    start = time.perf_counter()
+    for query in queries:
+        recommender._score(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dims', type=int, nargs='+', default=[32, 64, 128, 192])
+    parser.add_argument('--rescore', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    labeled = load_labeled_data('../data/train_labeled.csv')
+    recommender = AssessmentRecommender('../data/assessments.json')
+    full_dims = recommender.embeddings.shape[1]
+    results = {}
+    for dims in args.dims + [full_dims]:
+        results[dims] = [recall(recommender, labeled, dims, 0),
+                         recall(recommender, labeled, dims, args.rescore)]
+
+    # Latency on a synthetic catalog of the same width
+    rng = np.random.default_rng(0)
+    recommender.embeddings = AssessmentRecommender._normalize(
+        rng.standard_normal((args.rows, full_dims), dtype=np.float32)
+    )
+    queries = AssessmentRecommender._normalize(
+        rng.standard_normal((args.queries, full_dims), dtype=np.float32)
+    )
+    for dims in results:
+        results[dims].append(latency_ms(recommender, queries, dims, args.rescore))
+
+    print(f"\n{'dims':>5} | {'recall@10 prefix':>16} {'+ rescore':>10} | "
+          f"{f'ms/query @ {args.rows:,} rows':>24} {'speedup':>8}")
+    baseline = results[full_dims][2]
+    for dims, (prefix_only, rescored, ms) in results.items():
+        label = f"{dims}" if dims < full_dims else f"{dims}*"
+        print(f"{label:>5} | {prefix_only:16.4f} {rescored:10.4f} | {ms:24.3f} {baseline / ms:7.2f}x")
+    print(f"\n* full vectors, no prefix pass; rescoring {args.rescore} candidates")
@@ -0,0 +1,85 @@
+"""
+Build a local model bundle for MODEL_PATH / OFFLINE_MODE=1
+Downloads the sentence-transformers model once and saves it with its
+tokenizer and config, weights as model.safetensors (memory-mapped at load
+time), plus a bundle.json manifest. The bundle is then reloaded with hub
+access disabled and checked against the original model.
+
+Usage: python scripts/build_model_bundle.py [--model NAME] [--output DIR]
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+SAMPLE_TEXTS = ['Java developer', 'collaborate effectively with business teams']
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build(model_name: str, output_dir: str):
+    model = SentenceTransformer(model_name, device='cpu')
+    model.save(output_dir)
+
+    # Older transformers save pytorch_model.bin; the service maps safetensors
+    weights = os.path.join(output_dir, 'model.safetensors')
+    legacy = os.path.join(output_dir, 'pytorch_model.bin')
+    if not os.path.exists(weights):
+        from safetensors.torch import save_file
+        state = {k: v.contiguous() for k, v in model[0].auto_model.state_dict().items()}
+        save_file(state, weights, metadata={'format': 'pt'})
+    if os.path.exists(legacy):
+        os.remove(legacy)
+
+    files = {}
+    for root, _, names in os.walk(output_dir):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            files[os.path.relpath(path, output_dir)] = _sha256(path)
+    with open(os.path.join(output_dir, 'bundle.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_name': model_name,
+            'dimension': model.get_sentence_embedding_dimension(),
+            'max_seq_length': model.max_seq_length,
+            'files': files
+        }, f, indent=2)
+    print(f"✓ Wrote {len(files)} files to {output_dir}")
+    return model.encode(SAMPLE_TEXTS)
+
+
+def verify(model_name: str, output_dir: str, reference: np.ndarray):
+    """Reload the bundle in a fresh process with OFFLINE_MODE=1"""
+    code = (
+        "import sys, json; sys.path.insert(0, sys.argv[1]);"
+        "from encoders import load_encoder;"
+        f"print(json.dumps(load_encoder({model_name!r}).encode({SAMPLE_TEXTS!r}).tolist()))"
+    )
+    backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+    env = dict(os.environ, ENCODER_BACKEND='torch', MODEL_PATH=output_dir, OFFLINE_MODE='1')
+    output = subprocess.check_output([sys.executable, '-c', code, backend_dir], env=env)
+    loaded = np.array(json.loads(output.decode().strip().splitlines()[-1]), dtype=np.float32)
+    error = float(np.abs(loaded - reference).max())
+    if error > 1e-4:
+        raise SystemExit(f"❌ Offline bundle output differs from the hub model (max abs {error:.2e})")
+    print(f"✓ Offline load matches (max abs diff {error:.2e})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=os.getenv('EMBEDDING_MODEL', 'paraphrase-MiniLM-L3-v2'))
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), '..', 'backend', 'models', 'bundle'))
+    args = parser.parse_args()
+    output_dir = os.path.abspath(args.output)
+    reference = build(args.model, output_dir)
+    verify(args.model, output_dir, reference)
@@ -0,0 +1,28 @@
+"""
+Build the recommender index once and write it as a snapshot for SNAPSHOT_PATH
+The snapshot holds the catalog columns, normalized embeddings, response
+fragments, term table and BM25 index; a new process memory-maps it instead
+of parsing and encoding the catalog.
+
+Usage: python scripts/build_snapshot.py [--catalog PATH] [--output PATH]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--catalog', default=None, help='defaults to the path the service would find')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'recommender.snapshot'))
+    args = parser.parse_args()
+
+    # Build from the catalog itself, synchronously
+    os.environ.pop('SNAPSHOT_PATH', None)
+    os.environ['PROGRESSIVE_STARTUP'] = '0'
+    from recommender import AssessmentRecommender
+
+    catalog = os.path.abspath(args.catalog) if args.catalog else None
+    AssessmentRecommender(catalog).save_snapshot(os.path.abspath(args.output))
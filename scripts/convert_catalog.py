@@ -0,0 +1,38 @@
+"""
+Convert assessments.json into a memory-mappable Arrow catalog
+Embeddings, response fragments, the skill index and the term table are
+computed once and stored alongside the assessments, so the API can start
+without re-encoding the catalog or rebuilding indexes.
+
+Usage: python scripts/convert_catalog.py [input.json] [output.arrow]
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from catalog import write_arrow
+from recommender import AssessmentRecommender
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    input_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(data_dir, 'assessments.json')
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(input_path)[0] + '.arrow'
+
+    print(f"Encoding {input_path}...")
+    recommender = AssessmentRecommender(input_path)
+
+    write_arrow(
+        output_path,
+        recommender.assessments,
+        recommender.embeddings,
+        recommender.response_fragments,
+        recommender.model_name,
+        skill_index=recommender.skill_index,
+        term_table=recommender.term_table
+    )
+    print(f"\n✓ Wrote {len(recommender.assessments)} assessments to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Distill the sentence-transformers encoder into static token embeddings
+Every vocabulary token is embedded once through the full model; queries are
+then encoded by StaticEncoder as a weighted mean of token vectors
+(ENCODER_BACKEND=static, or STATIC_QUERY_MAX_TOKENS for short queries only).
+Token weights are IDF over the catalog texts and the query files.
+
+Usage: python scripts/distill_static_encoder.py [--model NAME] [--output DIR]
+       [--catalog PATH] [--queries CSV ...]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from catalog import Catalog
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def weighting_corpus(catalog_path: str, query_paths: list) -> list:
+    """Catalog index texts plus every distinct query in the CSV files"""
+    with open(catalog_path, 'r', encoding='utf-8') as f:
+        catalog = Catalog.from_records(json.load(f))
+    texts = [catalog.index_text(i) for i in range(len(catalog))]
+    queries = set()
+    for path in query_paths:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            queries.update(row['query'] for row in csv.DictReader(f))
+    return texts + sorted(queries)
+
+
+def idf_weights(tokenizer, texts: list) -> np.ndarray:
+    """
+    Smoothed IDF per vocabulary token over `texts`: frequent tokens carry
+    little weight, and tokens the corpus never uses get the largest weight
+    """
+    document_frequency = np.zeros(len(tokenizer), dtype=np.float64)
+    for ids in tokenizer(texts, add_special_tokens=False)['input_ids']:
+        document_frequency[np.unique(ids)] += 1
+    weights = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    weights[list(tokenizer.all_special_ids)] = 0.0
+    return weights.astype(np.float32)
+
+
+def distill(model_name: str, output_dir: str, batch_size: int, corpus: list):
+    os.makedirs(output_dir, exist_ok=True)
+    model = SentenceTransformer(model_name, device='cpu')
+    tokenizer = model.tokenizer
+
+    vocab_size = len(tokenizer)
+    tokens = tokenizer.convert_ids_to_tokens(list(range(vocab_size)))
+    # Continuation pieces are embedded as their surface text
+    texts = [t[2:] if t.startswith('##') else t for t in tokens]
+
+    print(f"Encoding {vocab_size} tokens with {model_name}...")
+    vectors = model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                           show_progress_bar=True).astype(np.float32)
+
+    weights = idf_weights(tokenizer, corpus)
+    print(f"Weighted tokens by IDF over {len(corpus)} catalog and query texts")
+
+    np.save(os.path.join(output_dir, 'embeddings.npy'), vectors)
+    np.save(os.path.join(output_dir, 'weights.npy'), weights)
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, 'encoder_config.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_name': model_name,
+            'dimension': int(vectors.shape[1]),
+            'vocab_size': vocab_size,
+            'weighting': 'idf',
+            'weighting_texts': len(corpus)
+        }, f, indent=2)
+    print(f"✓ Saved static encoder to {output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=os.getenv('EMBEDDING_MODEL', 'paraphrase-MiniLM-L3-v2'))
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), '..', 'backend', 'models', 'static'))
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--catalog', default=os.path.join(DATA_DIR, 'assessments.json'))
+    parser.add_argument('--queries', nargs='*', default=[
+        os.path.join(DATA_DIR, 'train_labeled.csv'), os.path.join(DATA_DIR, 'test_unlabeled.csv')
+    ])
+    args = parser.parse_args()
+    distill(args.model, args.output, args.batch_size, weighting_corpus(args.catalog, args.queries))
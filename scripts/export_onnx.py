@@ -0,0 +1,89 @@
+"""
+Export the sentence-transformers encoder to ONNX for ENCODER_BACKEND=onnx
+The exported graph includes mean pooling, so it outputs sentence embeddings
+directly. --quantize also writes a dynamically int8-quantized copy.
+
+Usage: python scripts/export_onnx.py [--model NAME] [--output DIR] [--quantize]
+"""
+import argparse
+import json
+import os
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+
+class MeanPooledEncoder(torch.nn.Module):
+    """Transformer followed by attention-masked mean pooling"""
+
+    def __init__(self, transformer):
+        super().__init__()
+        self.transformer = transformer
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        token_embeddings = self.transformer(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids
+        )[0]
+        mask = attention_mask.unsqueeze(-1).to(token_embeddings.dtype)
+        summed = (token_embeddings * mask).sum(dim=1)
+        counts = mask.sum(dim=1).clamp(min=1e-9)
+        return summed / counts
+
+
+def export(model_name: str, output_dir: str, quantize: bool):
+    os.makedirs(output_dir, exist_ok=True)
+    model = SentenceTransformer(model_name, device='cpu')
+
+    pooling = model[1]
+    if not getattr(pooling, 'pooling_mode_mean_tokens', False) or len(model) > 2:
+        raise ValueError(f"{model_name} is not a transformer + mean pooling model")
+
+    tokenizer = model.tokenizer
+    wrapper = MeanPooledEncoder(model[0].auto_model).eval()
+    sample = tokenizer(['Java developer', 'collaborate with business teams'],
+                       padding=True, return_tensors='pt')
+
+    model_path = os.path.join(output_dir, 'model.onnx')
+    dynamic = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            (sample['input_ids'], sample['attention_mask'], sample['token_type_ids']),
+            model_path,
+            input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+            output_names=['sentence_embedding'],
+            dynamic_axes={
+                'input_ids': dynamic,
+                'attention_mask': dynamic,
+                'token_type_ids': dynamic,
+                'sentence_embedding': {0: 'batch'}
+            },
+            opset_version=14
+        )
+    print(f"✓ Exported {model_path}")
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, 'encoder_config.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_name': model_name,
+            'max_seq_length': model.max_seq_length,
+            'dimension': model.get_sentence_embedding_dimension(),
+            'pad_token_id': tokenizer.pad_token_id or 0
+        }, f, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantized_path = os.path.join(output_dir, 'model_quantized.onnx')
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+        print(f"✓ Quantized {quantized_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=os.getenv('EMBEDDING_MODEL', 'paraphrase-MiniLM-L3-v2'))
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), '..', 'backend', 'models', 'onnx'))
+    parser.add_argument('--quantize', action='store_true')
+    args = parser.parse_args()
+    export(args.model, args.output, args.quantize)
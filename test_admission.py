@@ -0,0 +1,143 @@
+"""
+Tests for request coalescing and admission control on /recommend
+Requests go through the ASGI app in-process (httpx.ASGITransport), with
+compute_page slowed down so concurrent requests overlap.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+sys.path.append('backend')
+
+
+def _app(max_concurrent: int = 4, max_queue: int = 64, timeout: float = 2.0):
+    """The app module with a loaded recommender, an empty response cache and fresh limits"""
+    import app
+    from admission import AdmissionController
+    from recommender import AssessmentRecommender
+
+    if app.recommender is None:
+        app.recommender = AssessmentRecommender('data/assessments.json')
+    app.response_cache.clear()
+    app.admission = AdmissionController(max_concurrent, max_queue, timeout)
+    return app
+
+
+def _slow_compute(app, calls: list, delay: float = 0.3, error: Exception = None):
+    """compute_page that records each call and holds its slot for `delay` seconds"""
+    compute_page = app.compute_page
+
+    def slow(rec, query, *args, **kwargs):
+        calls.append(query)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return compute_page(rec, query, *args, **kwargs)
+    return slow
+
+
+def _counter(name: str) -> int:
+    from metrics import metrics
+    return metrics.snapshot()['counters'].get(name, 0)
+
+
+async def _post(app, queries: list) -> list:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url='http://test') as client:
+        return await asyncio.gather(*[
+            client.post('/recommend', json={'query': query, 'top_k': 5}) for query in queries
+        ])
+
+
+def test_identical_requests_compute_once():
+    """N concurrent identical requests share one compute_page call"""
+    app, calls, n = _app(), [], 8
+    original, app.compute_page = app.compute_page, _slow_compute(app, calls)
+    try:
+        coalesced = _counter('coalesced_requests')
+        responses = asyncio.run(_post(app, ['Java developer who collaborates'] * n))
+    finally:
+        app.compute_page = original
+    assert [r.status_code for r in responses] == [200] * n
+    assert len({r.content for r in responses}) == 1
+    assert len(calls) == 1
+    assert _counter('coalesced_requests') - coalesced == n - 1
+    print("✓ identical requests computed once")
+
+
+def test_failure_reaches_every_waiter():
+    """An exception in the shared computation fails every coalesced request"""
+    app, calls, n = _app(), [], 4
+    original = app.compute_page
+    app.compute_page = _slow_compute(app, calls, error=RuntimeError('encoder failed'))
+    try:
+        responses = asyncio.run(_post(app, ['Python SQL analyst'] * n))
+    finally:
+        app.compute_page = original
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [500] * n
+    assert all('encoder failed' in r.json()['detail'] for r in responses)
+    print("✓ shared failure raised in every waiter")
+
+
+def test_full_queue_is_shed_with_retry_after():
+    """Requests beyond max_concurrent + max_queue get 503 and Retry-After"""
+    app, calls = _app(max_concurrent=1, max_queue=1, timeout=5.0), []
+    original, app.compute_page = app.compute_page, _slow_compute(app, calls)
+    try:
+        shed = _counter('admission_shed_queue_full')
+        responses = asyncio.run(_post(app, [f'Java developer {i}' for i in range(4)]))
+    finally:
+        app.compute_page = original
+    assert sorted(r.status_code for r in responses) == [200, 200, 503, 503]
+    assert all(int(r.headers['Retry-After']) >= 1 for r in responses if r.status_code == 503)
+    assert _counter('admission_shed_queue_full') - shed == 2
+    print("✓ full queue shed with 503 and Retry-After")
+
+
+def test_deadline_is_shed_with_retry_after():
+    """A request that cannot start within the admission timeout gets 503 and Retry-After"""
+    app, calls = _app(max_concurrent=1, max_queue=8, timeout=0.1), []
+    original, app.compute_page = app.compute_page, _slow_compute(app, calls)
+    try:
+        shed = _counter('admission_shed_deadline')
+        responses = asyncio.run(_post(app, [f'Leadership and teamwork {i}' for i in range(3)]))
+    finally:
+        app.compute_page = original
+    assert sorted(r.status_code for r in responses) == [200, 503, 503]
+    assert all(int(r.headers['Retry-After']) >= 1 for r in responses if r.status_code == 503)
+    assert _counter('admission_shed_deadline') - shed == 2
+    print("✓ requests past the deadline shed with 503 and Retry-After")
+
+
+def test_cancelled_waiter_keeps_shared_task():
+    """A client that goes away does not cancel the computation other requests await"""
+    app, calls = _app(), []
+    original, app.compute_page = app.compute_page, _slow_compute(app, calls)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url='http://test') as client:
+            body = {'query': 'Cognitive and personality tests', 'top_k': 5}
+            first = asyncio.ensure_future(client.post('/recommend', json=body))
+            second = asyncio.ensure_future(client.post('/recommend', json=body))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            return await second
+
+    try:
+        response = asyncio.run(run())
+    finally:
+        app.compute_page = original
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert not app.inflight
+    print("✓ cancelled waiter left the shared task running")
+
+
+if __name__ == "__main__":
+    test_identical_requests_compute_once()
+    test_failure_reaches_every_waiter()
+    test_full_queue_is_shed_with_retry_after()
+    test_deadline_is_shed_with_retry_after()
+    test_cancelled_waiter_keeps_shared_task()
@@ -98,11 +98,42 @@ def test_response_format():
         
         print("✓ Response format is compliant")
 
+def test_pagination():
+    """Test top_k and cursor pagination"""
+    print("\n\nTesting pagination...")
+    
+    query = "Java developer"
+    response = requests.post(f"{API_URL}/recommend", json={"query": query, "top_k": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["recommended_assessments"]) <= 3
+    
+    seen = [a["url"] for a in data["recommended_assessments"]]
+    cursor = data.get("next_cursor")
+    while cursor:
+        response = requests.post(f"{API_URL}/recommend", json={"query": query, "cursor": cursor})
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(a["url"] for a in data["recommended_assessments"])
+        cursor = data.get("next_cursor")
+    
+    assert len(seen) == len(set(seen)), "Pages should not repeat assessments"
+    
+    # Cursor issued for a different query is rejected
+    response = requests.post(f"{API_URL}/recommend", json={"query": "Python", "top_k": 3})
+    cursor = response.json().get("next_cursor")
+    if cursor:
+        response = requests.post(f"{API_URL}/recommend", json={"query": query, "cursor": cursor})
+        assert response.status_code == 400
+    
+    print(f"✓ Paged through {len(seen)} assessments without duplicates")
+
 if __name__ == "__main__":
     try:
         test_health()
         test_recommend()
         test_response_format()
+        test_pagination()
         print("\n" + "="*50)
         print("ALL TESTS PASSED ✓")
         print("="*50)
@@ -0,0 +1,121 @@
+"""
+Tests for the BM25 degradation policy (DEGRADE_QUEUE_WAIT_MS)
+Queries are only served by BM25 when the policy is switched on and the
+encoder is saturated; a lexical index alone never degrades a request.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+CHECK = """
+import sys, time
+sys.path.insert(0, 'backend')
+from recommender import AssessmentRecommender
+r = AssessmentRecommender('data/assessments.json')
+{setup}
+ranking = r.rank('Java developer who collaborates with business teams', top_k=5, queue_wait_ms=50.0)
+print(r.lexical_index is not None, ranking.degraded, ranking.engine)
+"""
+
+
+def _run(setup: str = '', **env) -> str:
+    env = {k: v for k, v in dict(os.environ, **env).items() if v is not None}
+    return subprocess.check_output([sys.executable, '-c', CHECK.format(setup=setup)], env=env).decode()
+
+
+def _rank(setup: str = '', **env) -> list:
+    """(has lexical index, degraded, engine) for one query"""
+    return _run(setup, **env).strip().splitlines()[-1].split()
+
+
+def test_lexical_index_without_policy_is_not_degraded():
+    """With DEGRADE_QUEUE_WAIT_MS unset a recommender holding BM25 still ranks densely"""
+    env = dict(DEGRADE_QUEUE_WAIT_MS=None, RECOMMENDER_MODE='dense')
+    has_lexical, degraded, engine = _rank(
+        "from lexical import BM25Index\n"
+        "r.lexical_index = BM25Index(r.assessments.index_text(i) for i in range(len(r.assessments)))",
+        **env
+    )
+    assert has_lexical == 'True'
+    assert (degraded, engine) == ('False', 'dense')
+    print("✓ lexical index without DEGRADE_QUEUE_WAIT_MS is not degraded")
+
+
+def test_progressive_startup_serves_dense_after_switch():
+    """PROGRESSIVE_STARTUP keeps its BM25 index, but stops using it once dense is ready"""
+    has_lexical, degraded, engine = _rank(
+        "while r.dense_ready_at is None: time.sleep(0.05)",
+        DEGRADE_QUEUE_WAIT_MS=None, RECOMMENDER_MODE='dense', PROGRESSIVE_STARTUP='1'
+    )
+    assert has_lexical == 'True'
+    assert (degraded, engine) == ('False', 'dense')
+    print("✓ progressive startup serves dense rankings after the switch")
+
+
+def test_lexical_cursor_survives_dense_switch():
+    """Pages of a ranking started before the progressive switch stay on BM25 after it"""
+    query = 'Java developer who collaborates with business teams'
+    output = _run(
+        # The first page as served before the switch, whenever the switch lands
+        f"first = r.rank({query!r}, top_k=3, engine='lexical')\n"
+        "while r.dense_ready_at is None: time.sleep(0.05)\n"
+        f"pages = [first] + [r.rank({query!r}, top_k=3, offset=o, engine=first.engine) for o in (3, 6, 9)]\n"
+        "seen = [i for page in pages for i in page.indices]\n"
+        "assert all(page.engine == 'lexical' for page in pages)\n"
+        "assert len(seen) == len(set(seen)) == len(r.assessments), seen\n"
+        "print('pages continue')",
+        DEGRADE_QUEUE_WAIT_MS=None, RECOMMENDER_MODE='dense', PROGRESSIVE_STARTUP='1'
+    )
+    assert 'pages continue' in output
+    print("✓ lexical cursor pages continue after the dense switch")
+
+
+def test_snapshot_paths_serve_dense():
+    """save_snapshot() in-process and a SNAPSHOT_PATH restore both keep dense ranking"""
+    path = os.path.join(tempfile.mkdtemp(), 'recommender.snapshot')
+    has_lexical, degraded, engine = _rank(
+        f"r.save_snapshot({path!r})", DEGRADE_QUEUE_WAIT_MS=None, RECOMMENDER_MODE='dense'
+    )
+    assert has_lexical == 'True'
+    assert (degraded, engine) == ('False', 'dense')
+
+    output = _run(DEGRADE_QUEUE_WAIT_MS=None, RECOMMENDER_MODE='dense', SNAPSHOT_PATH=path)
+    has_lexical, degraded, engine = output.strip().splitlines()[-1].split()
+    assert 'from snapshot' in output
+    assert has_lexical == 'True'
+    assert (degraded, engine) == ('False', 'dense')
+    print("✓ saved and restored snapshots serve dense rankings")
+
+
+def test_policy_degrades_saturated_requests():
+    """A request that waited past DEGRADE_QUEUE_WAIT_MS is served by BM25"""
+    _, degraded, engine = _rank(DEGRADE_QUEUE_WAIT_MS='10', RECOMMENDER_MODE='dense')
+    assert (degraded, engine) == ('True', 'lexical')
+    print("✓ saturated request degraded to BM25")
+
+
+def test_pages_after_degraded_page_continue_bm25():
+    """A degraded first page names the lexical engine; later pages keep that ranking"""
+    query = 'Java developer who collaborates with business teams'
+    output = _run(
+        f"first = r.rank({query!r}, top_k=3, queue_wait_ms=50.0)\n"
+        "assert first.degraded and first.engine == 'lexical'\n"
+        f"pages = [first] + [r.rank({query!r}, top_k=3, offset=o, engine=first.engine) for o in (3, 6, 9)]\n"
+        "seen = [i for page in pages for i in page.indices]\n"
+        "assert all(page.engine == 'lexical' for page in pages)\n"
+        "assert len(seen) == len(set(seen)) == len(r.assessments), seen\n"
+        "print('pages continue')",
+        DEGRADE_QUEUE_WAIT_MS='10', RECOMMENDER_MODE='dense'
+    )
+    assert 'pages continue' in output
+    print("✓ pages after a degraded first page continue the BM25 ranking")
+
+
+if __name__ == "__main__":
+    test_lexical_index_without_policy_is_not_degraded()
+    test_progressive_startup_serves_dense_after_switch()
+    test_lexical_cursor_survives_dense_switch()
+    test_snapshot_paths_serve_dense()
+    test_policy_degrades_saturated_requests()
+    test_pages_after_degraded_page_continue_bm25()
@@ -0,0 +1,78 @@
+"""
+Parity tests for the ONNX encoder backend
+Requires an exported model: python scripts/export_onnx.py --quantize
+Tests skip when no exported model is found at ENCODER_PATH.
+"""
+import subprocess
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.append('backend')
+
+ONNX_DIR = os.getenv('ENCODER_PATH', 'backend/models/onnx')
+FP32_THRESHOLD = 0.999
+INT8_THRESHOLD = 0.98
+
+TEXTS = [
+    "I am hiring for Java developers who can also collaborate effectively with my business teams.",
+    "Looking to hire mid-level professionals who are proficient in Python, SQL and JavaScript.",
+    "Need assessments for an analyst role. Want to screen using Cognitive and personality tests.",
+    "Java developer",
+    "Leadership and teamwork",
+]
+
+
+def _require_exported_model():
+    if not os.path.exists(os.path.join(ONNX_DIR, 'encoder_config.json')):
+        pytest.skip(f"no exported ONNX model in {ONNX_DIR}")
+
+
+def _min_cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float((a * b).sum(axis=1).min())
+
+
+def test_onnx_parity():
+    """ONNX fp32 and int8 embeddings agree with the torch backend"""
+    _require_exported_model()
+    pytest.importorskip("sentence_transformers")
+    from encoders import OnnxEncoder, SentenceTransformerEncoder
+
+    onnx_encoder = OnnxEncoder(ONNX_DIR)
+    reference = SentenceTransformerEncoder(onnx_encoder.model_name).encode(TEXTS)
+
+    cosine = _min_cosine(reference, onnx_encoder.encode(TEXTS))
+    print(f"fp32 min cosine: {cosine:.5f}")
+    assert cosine >= FP32_THRESHOLD
+
+    if os.path.exists(os.path.join(ONNX_DIR, 'model_quantized.onnx')):
+        cosine = _min_cosine(reference, OnnxEncoder(ONNX_DIR, quantized=True).encode(TEXTS))
+        print(f"int8 min cosine: {cosine:.5f}")
+        assert cosine >= INT8_THRESHOLD
+    print("✓ ONNX parity passed")
+
+
+def test_onnx_backend_does_not_import_torch():
+    """Selecting the ONNX backend never imports torch"""
+    _require_exported_model()
+    code = (
+        "import sys; sys.path.insert(0, 'backend');"
+        "from recommender import AssessmentRecommender;"
+        "AssessmentRecommender('data/assessments.json').recommend('Java developer');"
+        "print('torch' in sys.modules)"
+    )
+    env = dict(os.environ, ENCODER_BACKEND='onnx', ENCODER_PATH=ONNX_DIR)
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    assert output.decode().strip().splitlines()[-1] == 'False'
+    print("✓ torch not imported with ENCODER_BACKEND=onnx")
+
+
+if __name__ == "__main__":
+    for test in (test_onnx_parity, test_onnx_backend_does_not_import_torch):
+        try:
+            test()
+        except pytest.skip.Exception as e:
+            print(f"- {test.__name__} skipped: {e}")
@@ -0,0 +1,40 @@
+"""
+Paging through a first page served by the semantic cache
+Every page of a near-duplicate query continues the ranking its first page
+came from, so cursor pages never repeat or skip assessments.
+"""
+import sys
+
+sys.path.append('backend')
+
+QUERY = "Java developer who collaborates with business teams"
+NEAR_DUPLICATE = "Java developer with a personality and cognitive test, strong in teamwork"
+
+
+def test_semantic_pages_continue_first_page():
+    """Pages of a semantically served query neither repeat nor skip assessments"""
+    from cache import SemanticCache
+    from recommender import AssessmentRecommender
+
+    recommender = AssessmentRecommender('data/assessments.json')
+    recommender._semantic_cache = SemanticCache(capacity=16, max_distance=1.0)
+    top_k = 3
+
+    recommender.rank(QUERY, top_k=top_k)
+    stored = len(recommender._semantic_cache)
+    pages = [
+        recommender.rank(NEAR_DUPLICATE, top_k=top_k, offset=offset)
+        for offset in range(0, len(recommender.assessments), top_k)
+    ]
+    assert len(recommender._semantic_cache) == stored, "first page was not a semantic hit"
+
+    source = [recommender.rank(QUERY, top_k=top_k, offset=offset).indices
+              for offset in range(0, len(recommender.assessments), top_k)]
+    served = [page.indices for page in pages]
+    assert served == source
+    assert sorted(i for page in served for i in page) == list(range(len(recommender.assessments)))
+    print("✓ semantic cache pages continue the first page")
+
+
+if __name__ == "__main__":
+    test_semantic_pages_continue_first_page()